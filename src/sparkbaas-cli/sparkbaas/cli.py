@@ -1,31 +1,143 @@
 #!/usr/bin/env python3
 import sys
 import argparse
+import importlib
 from pathlib import Path
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
+# Rich is imported on first use so that plain invocations don't pay for it
+console = None
 
-from sparkbaas.commands import (
-    init_cmd,
-    start_cmd,
-    stop_cmd,
-    status_cmd,
-    migrate_cmd,
-    backup_cmd,
-    restore_cmd,
-    functions_cmd,
-    upgrade_cmd,
-    reset_cmd
-)
-from sparkbaas.core.config import Config
-from sparkbaas.ui.console import print_banner
+# Subcommand name -> (module in sparkbaas.commands, help text).
+# Command modules are only imported when their subcommand is invoked.
+_COMMANDS = {
+    "init": ("init_cmd", "Initialize SparkBaaS platform"),
+    "reset": ("reset_cmd", "Reset SparkBaaS environment"),
+    "start": ("start_cmd", "Start all SparkBaaS services"),
+    "stop": ("stop_cmd", "Stop all SparkBaaS services"),
+    "status": ("status_cmd", "Check status of SparkBaaS services"),
+    "migrate": ("migrate_cmd", "Run database migrations"),
+    "backup": ("backup_cmd", "Backup SparkBaaS data"),
+    "restore": ("restore_cmd", "Restore SparkBaaS data from backup"),
+    "function": ("functions_cmd", "Manage serverless functions"),
+    "upgrade": ("upgrade_cmd", "Upgrade SparkBaaS components"),
+}
 
-console = Console()
+# Subcommands that never print the banner
+_NO_BANNER_COMMANDS = frozenset({"status"})
 
-def setup_parser():
-    """Set up the argument parser with all subcommands"""
+# Subcommand name -> handle() function, filled in as commands are loaded
+_HANDLERS = {}
+
+def _get_console():
+    """Get the shared Rich console, importing Rich on first use"""
+    global console
+    if console is None:
+        from sparkbaas.ui.console import console as ui_console
+        console = ui_console
+    return console
+
+def _sniff_subcommand(argv=None):
+    """
+    Find the subcommand in the raw command line without parsing it
+    
+    Args:
+        argv: Arguments to inspect (defaults to sys.argv[1:])
+        
+    Returns:
+        Subcommand name or None if no known subcommand is present
+    """
+    for arg in sys.argv[1:] if argv is None else argv:
+        if arg in _COMMANDS:
+            return arg
+    return None
+
+def _load_command(command):
+    """
+    Import the module implementing a subcommand
+    
+    Args:
+        command: Subcommand name
+        
+    Returns:
+        The command module
+    """
+    module_name = _COMMANDS[command][0]
+    return importlib.import_module(f"sparkbaas.commands.{module_name}")
+
+def _get_handler(command):
+    """
+    Get the handle() function for a subcommand, importing its module on demand
+    
+    Args:
+        command: Subcommand name
+        
+    Returns:
+        The command's handler, or None for an unknown command
+    """
+    handler = _HANDLERS.get(command)
+    if handler is None and command in _COMMANDS:
+        handler = _HANDLERS[command] = _load_command(command).handle
+    return handler
+
+def _lazy_handler(command):
+    """
+    Build a handler that imports the command module on first call
+    
+    Args:
+        command: Subcommand name
+        
+    Returns:
+        Callable taking the parsed args and returning the exit code
+    """
+    return lambda args: _get_handler(command)(args)
+
+def _deferred_setup(command, subparser):
+    """
+    Build a closure that registers a subcommand's arguments when called
+    
+    Args:
+        command: Subcommand name
+        subparser: The bare subparser created for the command
+        
+    Returns:
+        Zero-argument callable that imports the command module and populates
+        the subparser
+    """
+    return lambda: _load_command(command).setup_parser(subparser)
+
+def _prewarm_docker():
+    """
+    Start 'docker context show' in the background without waiting for it
+    
+    Resolving the active context reads the Docker CLI config and pulls the
+    binary into the page cache while the command module is still loading,
+    so the command's first real docker call starts warm.
+    """
+    import shutil
+    import subprocess
+    
+    docker = shutil.which("docker")
+    if docker is None:
+        return
+    try:
+        subprocess.Popen(
+            [docker, "context", "show"],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+    except OSError:
+        pass
+
+def setup_parser(command=None):
+    """
+    Set up the argument parser with all subcommands
+    
+    Every subcommand is registered so it shows up in the help output, but only
+    the arguments of the invoked one are populated, which keeps the other
+    command modules from being imported.
+    
+    Args:
+        command: Subcommand whose arguments should be registered
+    """
     parser = argparse.ArgumentParser(
         description="SparkBaaS CLI - DevOps-friendly Backend as a Service",
         formatter_class=argparse.RawDescriptionHelpFormatter
@@ -42,52 +154,27 @@ def setup_parser():
     # Create subparsers for different commands
     subparsers = parser.add_subparsers(dest="command", help="Commands")
     
-    # Init command
-    init_parser = subparsers.add_parser("init", help="Initialize SparkBaaS platform")
-    init_cmd.setup_parser(init_parser)
-    
-    # Reset command
-    reset_parser = subparsers.add_parser("reset", help="Reset SparkBaaS environment")
-    reset_cmd.setup_parser(reset_parser)
-    
-    # Start command
-    start_parser = subparsers.add_parser("start", help="Start all SparkBaaS services")
-    start_cmd.setup_parser(start_parser)
-    
-    # Stop command
-    stop_parser = subparsers.add_parser("stop", help="Stop all SparkBaaS services")
-    stop_cmd.setup_parser(stop_parser)
-    
-    # Status command
-    status_parser = subparsers.add_parser("status", help="Check status of SparkBaaS services")
-    status_cmd.setup_parser(status_parser)
-    
-    # Migrate command
-    migrate_parser = subparsers.add_parser("migrate", help="Run database migrations")
-    migrate_cmd.setup_parser(migrate_parser)
-    
-    # Backup command
-    backup_parser = subparsers.add_parser("backup", help="Backup SparkBaaS data")
-    backup_cmd.setup_parser(backup_parser)
-    
-    # Restore command
-    restore_parser = subparsers.add_parser("restore", help="Restore SparkBaaS data from backup")
-    restore_cmd.setup_parser(restore_parser)
-    
-    # Functions command
-    functions_parser = subparsers.add_parser("function", help="Manage serverless functions")
-    functions_cmd.setup_parser(functions_parser)
+    # Register bare subparsers; their arguments are filled in by a deferred
+    # setup call that only runs for the invoked subcommand
+    deferred = {}
+    for name, (module_name, help_text) in _COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.set_defaults(func=_lazy_handler(name))
+        deferred[name] = _deferred_setup(name, subparser)
     
-    # Upgrade command
-    upgrade_parser = subparsers.add_parser("upgrade", help="Upgrade SparkBaaS components")
-    upgrade_cmd.setup_parser(upgrade_parser)
+    if command in deferred:
+        deferred[command]()
     
     return parser
 
 def show_version():
     """Show version information"""
+    from rich.panel import Panel
+    from rich.table import Table
     from sparkbaas import __version__
+    from sparkbaas.core.config import Config
     
+    console = _get_console()
     console.print(Panel.fit(
         f"[bold cyan]SparkBaaS CLI[/bold cyan] [bold white]v{__version__}[/bold white]",
         border_style="cyan"
@@ -107,11 +194,39 @@ def show_version():
 
 def main():
     """Main entry point for the CLI"""
-    parser = setup_parser()
+    command = _sniff_subcommand()
+    argv = sys.argv[1:]
+    global_args = argv[:argv.index(command)] if command else argv
+    
+    # Fast paths: answer --version and bare help before loading any command
+    # modules or Rich. Use --verbose --version for the component table.
+    if "--version" in global_args and not {"--verbose", "-v"} & set(global_args):
+        from sparkbaas import __version__
+        print(f"SparkBaaS v{__version__}")
+        return 0
+    
+    if not command and global_args in ([], ["-h"], ["--help"]):
+        setup_parser().print_help()
+        return 0
+    
+    # Every subcommand talks to Docker
+    if command:
+        _prewarm_docker()
+    
+    parser = setup_parser(command)
+    if command is None:
+        # Sniffing found nothing, so let argparse identify the subcommand and
+        # rebuild the parser with its arguments before the real parse
+        command = parser.parse_known_args()[0].command
+        if command:
+            parser = setup_parser(command)
     args = parser.parse_args()
     
-    # Show the banner
-    print_banner()
+    # Show the banner, but only on an interactive terminal and not for
+    # commands whose output is meant to be read or parsed
+    if sys.stdout.isatty() and args.command not in _NO_BANNER_COMMANDS:
+        from sparkbaas.ui.console import print_banner
+        print_banner()
     
     # Handle version flag
     if args.version:
@@ -123,38 +238,22 @@ def main():
         parser.print_help()
         return 0
     
+    if args.verbose:
+        from sparkbaas.core.compose import DockerCompose
+        DockerCompose.verbose = True
+    
     try:
         # Dispatch to the appropriate command
-        if args.command == "init":
-            return init_cmd.handle(args)
-        elif args.command == "reset":
-            return reset_cmd.handle(args)
-        elif args.command == "start":
-            return start_cmd.handle(args)
-        elif args.command == "stop":
-            return stop_cmd.handle(args)
-        elif args.command == "status":
-            return status_cmd.handle(args)
-        elif args.command == "migrate":
-            return migrate_cmd.handle(args)
-        elif args.command == "backup":
-            return backup_cmd.handle(args)
-        elif args.command == "restore":
-            return restore_cmd.handle(args)
-        elif args.command == "function":
-            return functions_cmd.handle(args)
-        elif args.command == "upgrade":
-            return upgrade_cmd.handle(args)
+        return args.func(args)
     except KeyboardInterrupt:
-        console.print("\n[yellow]Operation cancelled by user[/yellow]")
+        _get_console().print("\n[yellow]Operation cancelled by user[/yellow]")
         return 1
     except Exception as e:
+        console = _get_console()
         console.print(f"[bold red]Error:[/bold red] {str(e)}")
         if args.verbose:
             console.print_exception()
         return 1
-    
-    return 0
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
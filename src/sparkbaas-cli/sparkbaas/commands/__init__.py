@@ -1,13 +1,6 @@
 """
 SparkBaaS CLI Command implementations
-"""
 
-from sparkbaas.commands import init_cmd
-from sparkbaas.commands import start_cmd
-from sparkbaas.commands import stop_cmd
-from sparkbaas.commands import status_cmd
-from sparkbaas.commands import migrate_cmd
-from sparkbaas.commands import backup_cmd
-from sparkbaas.commands import restore_cmd
-from sparkbaas.commands import functions_cmd
-from sparkbaas.commands import upgrade_cmd
\ No newline at end of file
+Command modules are imported on demand by sparkbaas.cli so that invoking one
+subcommand does not load the others.
+"""
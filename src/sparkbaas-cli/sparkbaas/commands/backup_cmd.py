@@ -1,17 +1,29 @@
 import os
 import sys
+import shutil
 from pathlib import Path
-import time
 import subprocess
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
 
 from sparkbaas.core.compose import DockerCompose
 from sparkbaas.core.config import Config
-from sparkbaas.core.utils import ensure_dir
+from sparkbaas.core.utils import ensure_dir, run_timestamp
 from sparkbaas.ui.console import (
     console, print_step, print_success, print_error, 
     print_warning, print_info, print_section, confirm, select
 )
 
+# Chunk size for copying pg_dump output off its pipe (matches the 64 KiB
+# pipe buffer, so each read drains whatever the dump has produced)
+PIPE_CHUNK_SIZE = 1 << 16
+
+# gzip level for compressed backups; trades a little size for much faster writes
+COMPRESS_LEVEL = 6
+
+# zstd level for compressed file storage backups
+ZSTD_LEVEL = 3
+
 def setup_parser(parser):
     """Set up command-line arguments for backup command"""
     parser.add_argument(
@@ -32,13 +44,16 @@ def setup_parser(parser):
     )
     return parser
 
-def backup_postgres(config, backup_dir):
+def backup_postgres(config, backup_dir, compress=False, start=None, compose=None):
     """
     Backup PostgreSQL database
     
     Args:
         config: Config instance
         backup_dir: Directory to store backups
+        compress: Whether to gzip the dump
+        start: Whether to start a stopped PostgreSQL container (asks if None)
+        compose: DockerCompose wrapper to reuse (a new one is created if omitted)
         
     Returns:
         True if successful, False otherwise
@@ -46,58 +61,51 @@ def backup_postgres(config, backup_dir):
     print_step("Backing up PostgreSQL database...")
     
     # Generate backup filename with timestamp
-    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    timestamp = run_timestamp("%Y%m%d_%H%M%S")
     backup_path = backup_dir / f"postgres_{timestamp}.sql"
     
     # Get Docker Compose wrapper
-    compose = DockerCompose()
+    if compose is None:
+        compose = DockerCompose()
     
     try:
         # Check if postgres container is running
-        ps_output = compose.run("ps", capture_output=True).stdout
-        if "postgres" not in ps_output:
-            print_warning("PostgreSQL container is not running.")
-            if not confirm("Start PostgreSQL container for backup?", default=True):
+        if not compose.service_running("postgres"):
+            if start is None:
+                print_warning("PostgreSQL container is not running.")
+                start = confirm("Start PostgreSQL container for backup?", default=True)
+            if not start:
                 print_info("PostgreSQL backup skipped.")
                 return True
             
             print_info("Starting PostgreSQL container...")
             compose.up(services=["postgres"], detached=True)
-            # Wait for postgres to be ready
-            time.sleep(5)
-        
-        # Run pg_dump in the postgres container
-        compose.run_service(
-            service="postgres",
-            command=f'pg_dump -U postgres -d postgres -f /tmp/backup.sql',
-            entrypoint=""
-        )
         
-        # Copy the backup file from the container to host
-        host_path = str(backup_path.absolute())
-        container_id = subprocess.run(
-            ["docker", "compose", "-f", str(compose.compose_file), "ps", "-q", "postgres"],
-            capture_output=True, text=True
-        ).stdout.strip()
-        
-        if not container_id:
-            print_error("Failed to get PostgreSQL container ID.")
+        # Wait for postgres to accept connections
+        if not compose.wait_for_service("postgres", ["pg_isready", "-U", "postgres"]):
+            print_error("PostgreSQL did not become ready in time.")
             return False
         
-        # Copy file from container to host
-        subprocess.run(
-            ["docker", "cp", f"{container_id}:/tmp/backup.sql", host_path],
-            check=True
-        )
-        
-        # Compress if requested
-        if hasattr(args, 'compress') and args.compress:
+        # Stream pg_dump from the running container straight to the host,
+        # compressing on the fly if requested
+        if compress:
             import gzip
-            with open(backup_path, 'rb') as f_in:
-                with gzip.open(f"{backup_path}.gz", 'wb') as f_out:
-                    f_out.write(f_in.read())
-            os.unlink(backup_path)
             backup_path = Path(f"{backup_path}.gz")
+            f_out = gzip.open(backup_path, 'wb', compresslevel=COMPRESS_LEVEL)
+        else:
+            f_out = open(backup_path, 'wb')
+        
+        with f_out, compose.exec_stream(
+            "postgres",
+            ["pg_dump", "-U", "postgres", "-d", "postgres"],
+            stdout=subprocess.PIPE
+        ) as proc:
+            shutil.copyfileobj(proc.stdout, f_out, length=PIPE_CHUNK_SIZE)
+        
+        if proc.returncode != 0:
+            backup_path.unlink(missing_ok=True)
+            print_error(f"pg_dump failed with exit code {proc.returncode}")
+            return False
         
         print_success(f"PostgreSQL backup created: {backup_path}")
         return True
@@ -105,13 +113,14 @@ def backup_postgres(config, backup_dir):
         print_error(f"Failed to backup PostgreSQL database: {str(e)}")
         return False
 
-def backup_files(config, backup_dir):
+def backup_files(config, backup_dir, compress=False):
     """
     Backup file storage
     
     Args:
         config: Config instance
         backup_dir: Directory to store backups
+        compress: Whether to compress the archive (zstd if installed, else gzip)
         
     Returns:
         True if successful, False otherwise
@@ -119,7 +128,7 @@ def backup_files(config, backup_dir):
     print_step("Backing up file storage...")
     
     # Generate backup filename with timestamp
-    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    timestamp = run_timestamp("%Y%m%d_%H%M%S")
     backup_path = backup_dir / f"files_{timestamp}.tar"
     
     try:
@@ -136,10 +145,35 @@ def backup_files(config, backup_dir):
             print_info("No file storage directories found. Skipping file backup.")
             return True
         
-        # Create tar archive
-        from tarfile import TarFile
+        # Create tar archive, compressing inline when requested so no
+        # uncompressed intermediate archive is ever written. zstd is used when
+        # available (much faster than gzip at a similar ratio).
+        import tarfile
         
-        with TarFile.open(backup_path, "w") as tar:
+        zstandard = None
+        if compress:
+            try:
+                import zstandard
+            except ImportError:
+                pass
+        
+        with ExitStack() as stack:
+            if zstandard:
+                backup_path = Path(f"{backup_path}.zst")
+                compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+                stream = stack.enter_context(
+                    compressor.stream_writer(open(backup_path, 'wb'))
+                )
+                # Stream mode writes sequentially without seeking
+                tar = stack.enter_context(tarfile.open(fileobj=stream, mode="w|"))
+            elif compress:
+                backup_path = Path(f"{backup_path}.gz")
+                tar = stack.enter_context(
+                    tarfile.open(backup_path, "w:gz", compresslevel=COMPRESS_LEVEL)
+                )
+            else:
+                tar = stack.enter_context(tarfile.open(backup_path, "w"))
+            
             for storage_dir in storage_dirs:
                 if storage_dir.exists():
                     tar.add(
@@ -147,15 +181,6 @@ def backup_files(config, backup_dir):
                         arcname=storage_dir.name
                     )
         
-        # Compress if requested
-        if hasattr(args, 'compress') and args.compress:
-            import gzip
-            with open(backup_path, 'rb') as f_in:
-                with gzip.open(f"{backup_path}.gz", 'wb') as f_out:
-                    f_out.write(f_in.read())
-            os.unlink(backup_path)
-            backup_path = Path(f"{backup_path}.gz")
-        
         print_success(f"File storage backup created: {backup_path}")
         return True
     except Exception as e:
@@ -183,14 +208,40 @@ def handle(args):
     # Ensure backup directory exists
     ensure_dir(backup_dir)
     
-    # Backup PostgreSQL
+    # Ask about starting PostgreSQL before the file backup starts printing
+    # from its worker thread, so its output can't land inside the prompt
+    compose = DockerCompose()
+    start_postgres = None
+    postgres_failed = False
     if not args.skip_postgres:
-        if not backup_postgres(config, backup_dir):
-            print_warning("PostgreSQL backup failed.")
+        try:
+            if not compose.service_running("postgres"):
+                print_warning("PostgreSQL container is not running.")
+                start_postgres = confirm("Start PostgreSQL container for backup?", default=True)
+        except Exception as e:
+            # Docker is unreachable; still back up file storage
+            print_error(f"Failed to check the PostgreSQL container: {str(e)}")
+            postgres_failed = True
     
-    # Backup files
-    if not args.skip_files:
-        if not backup_files(config, backup_dir):
+    # The two backups touch disjoint resources, so archive file storage in a
+    # worker thread while PostgreSQL is dumped
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        files_future = None
+        if not args.skip_files:
+            files_future = executor.submit(backup_files, config, backup_dir, args.compress)
+        
+        # Backup PostgreSQL
+        if postgres_failed:
+            print_warning("PostgreSQL backup failed.")
+        elif not args.skip_postgres:
+            if not backup_postgres(
+                config, backup_dir, args.compress,
+                start=start_postgres, compose=compose
+            ):
+                print_warning("PostgreSQL backup failed.")
+        
+        # Backup files
+        if files_future and not files_future.result():
             print_warning("File storage backup failed.")
     
     print_section("Backup Complete")
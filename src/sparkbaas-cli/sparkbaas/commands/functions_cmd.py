@@ -1,5 +1,6 @@
 import os
 import sys
+import stat
 import shutil
 from pathlib import Path
 import json
@@ -13,7 +14,6 @@ from sparkbaas.ui.console import (
     console, print_step, print_success, print_error, 
     print_warning, print_info, print_section, confirm, select
 )
-from rich.table import Table
 
 def setup_parser(parser):
     """Set up command-line arguments for function command"""
@@ -65,6 +65,56 @@ def setup_parser(parser):
     
     return parser
 
+# Display format for function timestamps
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Directories that never decide a function's runtime (dependencies, VCS, caches)
+RUNTIME_SCAN_SKIP_DIRS = frozenset({"node_modules", ".git", "venv", ".venv", "__pycache__"})
+
+# Stop scanning subdirectories once one extension has been seen this many times
+RUNTIME_SCAN_THRESHOLD = 3
+
+def _count_extensions(directory, exts):
+    """
+    Count source file extensions directly inside a directory
+    
+    Args:
+        directory: Directory to scan (not recursive)
+        exts: Dict of extension -> count, updated in place
+        
+    Returns:
+        List of subdirectory paths worth scanning next
+    """
+    subdirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in RUNTIME_SCAN_SKIP_DIRS:
+                    subdirs.append(entry.path)
+            elif entry.is_file():
+                ext = os.path.splitext(entry.name)[1].lower()
+                if ext in exts:
+                    exts[ext] += 1
+    return subdirs
+
+def _most_common_runtime(exts):
+    """
+    Pick the runtime whose extension strictly outnumbers the others
+    
+    Args:
+        exts: Dict of extension -> count
+        
+    Returns:
+        Runtime name or None if there is no clear winner
+    """
+    if exts['.js'] > exts['.py'] and exts['.js'] > exts['.go']:
+        return "node"
+    elif exts['.py'] > exts['.js'] and exts['.py'] > exts['.go']:
+        return "python"
+    elif exts['.go'] > exts['.js'] and exts['.go'] > exts['.py']:
+        return "go"
+    return None
+
 def detect_runtime(function_path):
     """
     Auto-detect the function runtime based on files present
@@ -103,21 +153,16 @@ def detect_runtime(function_path):
         if (path / "go.mod").exists():
             return "go"
         
-        # Count file extensions
+        # Count file extensions in the top two directory levels
         exts = {'.js': 0, '.py': 0, '.go': 0}
-        for file in path.glob('**/*'):
-            if file.is_file():
-                ext = file.suffix.lower()
-                if ext in exts:
-                    exts[ext] += 1
+        subdirs = _count_extensions(path, exts)
+        if _most_common_runtime(exts) is None:
+            for subdir in subdirs:
+                _count_extensions(subdir, exts)
+                if max(exts.values()) > RUNTIME_SCAN_THRESHOLD:
+                    break
         
-        # Use the most common extension
-        if exts['.js'] > exts['.py'] and exts['.js'] > exts['.go']:
-            return "node"
-        elif exts['.py'] > exts['.js'] and exts['.py'] > exts['.go']:
-            return "python"
-        elif exts['.go'] > exts['.js'] and exts['.go'] > exts['.py']:
-            return "go"
+        return _most_common_runtime(exts)
     
     return None
 
@@ -143,6 +188,9 @@ def save_function_metadata(config, metadata):
     """
     Save function metadata
     
+    The file is replaced atomically (see save_json), so a crash mid-deploy
+    leaves either the previous or the new metadata, never a partial file.
+    
     Args:
         metadata: Dict of function metadata
     """
@@ -165,15 +213,17 @@ def deploy_function(args, config):
     """
     function_path = Path(args.path)
     
-    # Check if path exists
-    if not function_path.exists():
+    # Check if path exists (stat once and reuse the result below)
+    try:
+        is_file = stat.S_ISREG(function_path.stat().st_mode)
+    except FileNotFoundError:
         print_error(f"Function path does not exist: {function_path}")
         return False
     
     # Determine function name
     function_name = args.name
     if not function_name:
-        if function_path.is_file():
+        if is_file:
             function_name = function_path.stem
         else:
             function_name = function_path.name
@@ -212,22 +262,19 @@ def deploy_function(args, config):
         # Remove existing function
         shutil.rmtree(function_dir)
     
-    # Create function directory
-    ensure_dir(function_dir)
-    
     # Copy function files
     print_info("Copying function files...")
-    if function_path.is_file():
+    if is_file:
         # Copy single file
+        ensure_dir(function_dir)
         shutil.copy(function_path, function_dir)
     else:
-        # Copy entire directory
-        for item in function_path.glob('**/*'):
-            if item.is_file():
-                rel_path = item.relative_to(function_path)
-                dest_path = function_dir / rel_path
-                ensure_dir(dest_path.parent)
-                shutil.copy(item, dest_path)
+        # Copy entire directory (copytree creates function_dir and uses the
+        # kernel's fast copy paths)
+        shutil.copytree(function_path, function_dir, dirs_exist_ok=True)
+    
+    # One timestamp for the whole deploy so created/updated match exactly
+    deployed_at = time.time()
     
     # Create function.json if it doesn't exist
     function_json = function_dir / "function.json"
@@ -240,8 +287,8 @@ def deploy_function(args, config):
             "timeout": 30,
             "memory": 128,
             "environment": {},
-            "created": time.time(),
-            "updated": time.time()
+            "created": deployed_at,
+            "updated": deployed_at
         }
         
         save_json(function_config, function_json)
@@ -251,18 +298,16 @@ def deploy_function(args, config):
     metadata[function_name] = {
         "runtime": runtime,
         "path": str(function_dir.relative_to(config.project_root)),
-        "created": time.time(),
-        "updated": time.time()
+        "created": deployed_at,
+        "updated": deployed_at
     }
     save_function_metadata(config, metadata)
     
     # Check if we need to restart the function service
     compose = DockerCompose()
-    ps_output = compose.run("ps", capture_output=True).stdout
-    if "functions" in ps_output:
+    if compose.service_running("functions"):
         print_info("Restarting functions service to apply changes...")
-        compose.stop(services=["functions"])
-        compose.up(services=["functions"], detached=True)
+        compose.restart(services=["functions"])
     
     print_success(f"Function '{function_name}' deployed successfully.")
     print_info(f"Invoke URL: http://localhost:8000/functions/{function_name}")
@@ -286,6 +331,8 @@ def list_functions(args, config):
         print_info("No functions deployed.")
         return True
     
+    from rich.table import Table
+    
     # Create table
     table = Table(title="Deployed Functions")
     table.add_column("Name", style="cyan")
@@ -294,10 +341,17 @@ def list_functions(args, config):
     table.add_column("Updated", style="yellow")
     table.add_column("Invoke URL", style="blue")
     
-    # Add rows
+    # Add rows, formatting each distinct timestamp only once (a fresh deploy
+    # has identical created/updated values)
+    formatted = {}
     for name, data in metadata.items():
-        created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(data.get("created", 0)))
-        updated = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(data.get("updated", 0)))
+        created_ts = data.get("created", 0)
+        updated_ts = data.get("updated", 0)
+        for ts in (created_ts, updated_ts):
+            if ts not in formatted:
+                formatted[ts] = time.strftime(TIMESTAMP_FORMAT, time.localtime(ts))
+        created = formatted[created_ts]
+        updated = formatted[updated_ts]
         url = f"http://localhost:8000/functions/{name}"
         
         table.add_row(name, data.get("runtime", "unknown"), created, updated, url)
@@ -361,11 +415,9 @@ def delete_function(args, config):
     
     # Check if we need to restart the function service
     compose = DockerCompose()
-    ps_output = compose.run("ps", capture_output=True).stdout
-    if "functions" in ps_output:
+    if compose.service_running("functions"):
         print_info("Restarting functions service to apply changes...")
-        compose.stop(services=["functions"])
-        compose.up(services=["functions"], detached=True)
+        compose.restart(services=["functions"])
     
     print_success(f"Function '{function_name}' deleted successfully.")
     
@@ -413,8 +465,7 @@ def show_function_logs(args, config):
     
     try:
         # Check if functions service is running
-        ps_output = compose.run("ps", capture_output=True).stdout
-        if "functions" not in ps_output:
+        if not compose.service_running("functions"):
             print_warning("Functions service is not running.")
             print_info("Start services with 'spark start' to see logs.")
             return False
@@ -439,6 +490,14 @@ def show_function_logs(args, config):
         print_error(f"Failed to show logs: {str(e)}")
         return False
 
+# Action name -> (section title, implementation)
+_ACTIONS = {
+    "deploy": ("Deploy Function", deploy_function),
+    "list": ("List Functions", list_functions),
+    "delete": ("Delete Function", delete_function),
+    "logs": ("Function Logs", show_function_logs),
+}
+
 def handle(args):
     """Handle function commands"""
     config = Config()
@@ -450,24 +509,14 @@ def handle(args):
         return 1
     
     # Dispatch to appropriate action
-    if args.action == "deploy":
-        print_section("Deploy Function")
-        if not deploy_function(args, config):
-            return 1
-    elif args.action == "list":
-        print_section("List Functions")
-        if not list_functions(args, config):
-            return 1
-    elif args.action == "delete":
-        print_section("Delete Function")
-        if not delete_function(args, config):
-            return 1
-    elif args.action == "logs":
-        print_section("Function Logs")
-        if not show_function_logs(args, config):
-            return 1
-    else:
+    action = _ACTIONS.get(args.action)
+    if action is None:
         print_error("Unknown action. Use 'spark function --help' for usage information.")
         return 1
     
-    return 0
\ No newline at end of file
+    title, func = action
+    print_section(title)
+    if not func(args, config):
+        return 1
+    
+    return 0
@@ -1,12 +1,11 @@
 import os
-import sys
-from pathlib import Path
-import time
+import hashlib
 
 from sparkbaas.core.compose import DockerCompose
 from sparkbaas.core.config import Config
+from sparkbaas.core.utils import run_timestamp
 from sparkbaas.ui.console import (
-    console, print_step, print_success, print_error, 
+    print_step, print_success, print_error, 
     print_warning, print_info, print_section, confirm, select
 )
 
@@ -26,10 +25,13 @@ def setup_parser(parser):
     )
     return parser
 
-def backup_database(config):
+def backup_database(config, compose=None):
     """
     Backup database before migration
     
+    Args:
+        compose: DockerCompose wrapper to reuse (a new one is created if omitted)
+        
     Returns:
         Tuple of (success, backup_path)
     """
@@ -40,26 +42,28 @@ def backup_database(config):
     backup_dir.mkdir(parents=True, exist_ok=True)
     
     # Generate backup filename with timestamp
-    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    timestamp = run_timestamp("%Y%m%d_%H%M%S")
     backup_path = backup_dir / f"pre_migration_{timestamp}.sql"
     
     # Get Docker Compose wrapper
-    compose = DockerCompose()
+    if compose is None:
+        compose = DockerCompose()
     
     try:
-        # Run pg_dump in the postgres container
-        compose.run_service(
-            service="postgres",
-            command=f'pg_dump -U postgres -d postgres -f /tmp/backup.sql',
-            entrypoint=""
-        )
+        # Run a single pg_dump in the running postgres container and let it
+        # write straight into the backup file on the host
+        with open(backup_path, 'wb') as f_out:
+            proc = compose.exec_stream(
+                "postgres",
+                ["pg_dump", "-U", "postgres", "-d", "postgres"],
+                stdout=f_out
+            )
+            returncode = proc.wait()
         
-        # Copy the backup file from the container
-        compose.run_service(
-            service="postgres",
-            command=f'cat /tmp/backup.sql > /var/lib/postgresql/data/backups/pre_migration_{timestamp}.sql',
-            entrypoint="sh -c"
-        )
+        if returncode != 0:
+            backup_path.unlink(missing_ok=True)
+            print_error(f"pg_dump failed with exit code {returncode}")
+            return False, None
         
         print_success(f"Database backup created: {backup_path}")
         return True, backup_path
@@ -67,12 +71,13 @@ def backup_database(config):
         print_error(f"Failed to backup database: {str(e)}")
         return False, None
 
-def run_migrations(config, schema=None):
+def run_migrations(config, schema=None, compose=None):
     """
     Run database migrations
     
     Args:
         schema: Specific schema to migrate (None for all)
+        compose: DockerCompose wrapper to reuse (a new one is created if omitted)
         
     Returns:
         True if successful, False otherwise
@@ -83,7 +88,8 @@ def run_migrations(config, schema=None):
     migrations_dir = config.get_migrations_dir()
     
     # Get Docker Compose wrapper
-    compose = DockerCompose()
+    if compose is None:
+        compose = DockerCompose()
     
     try:
         # Prepare migration command
@@ -106,6 +112,24 @@ def run_migrations(config, schema=None):
         print_error(f"Failed to run migrations: {str(e)}")
         return False
 
+def migrations_fingerprint(config):
+    """
+    Fingerprint the migration files on disk
+    
+    Hashes the relative path, mtime and size of every .sql file under the
+    migrations directory, so any added, removed or edited migration changes
+    the result without reading file contents.
+    
+    Returns:
+        Hex digest string
+    """
+    migrations_dir = config.get_migrations_dir()
+    digest = hashlib.sha256()
+    for path in sorted(migrations_dir.rglob("*.sql")):
+        st = path.stat()
+        digest.update(f"{path.relative_to(migrations_dir)}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+    return digest.hexdigest()
+
 def create_migration_file(config, name, schema):
     """
     Create a new migration file
@@ -121,7 +145,7 @@ def create_migration_file(config, name, schema):
     safe_name = name.lower().replace(" ", "_").replace("-", "_")
     
     # Generate timestamp
-    timestamp = time.strftime("%Y%m%d%H%M%S")
+    timestamp = run_timestamp("%Y%m%d%H%M%S")
     
     # Get migrations directory
     migrations_dir = config.get_migrations_dir()
@@ -140,7 +164,7 @@ def create_migration_file(config, name, schema):
     
     with open(migration_file, 'w') as f:
         f.write(f"-- Migration: {name}\n")
-        f.write(f"-- Created: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        f.write(f"-- Created: {run_timestamp('%Y-%m-%d %H:%M:%S')}\n\n")
         f.write("-- Write your SQL migration here\n\n")
     
     return migration_file
@@ -169,8 +193,9 @@ def handle(args):
                 
             print_info("Starting services...")
             compose.up(services=["postgres"], detached=True)
-            # Wait for postgres to be ready
-            time.sleep(5)
+            # Wait for postgres to accept connections rather than a fixed delay
+            if not compose.wait_for_service("postgres", ["pg_isready", "-U", "postgres"]):
+                print_warning("Postgres is not ready yet; migrations may fail.")
     except:
         pass
     
@@ -185,6 +210,8 @@ def handle(args):
     
     # Create a new migration
     if action == "create":
+        import questionary
+        
         schema = select(
             "Select schema:",
             choices=["core", "auth", "storage", "custom"],
@@ -192,7 +219,6 @@ def handle(args):
         )
         
         if schema == "custom":
-            import questionary
             schema = questionary.text("Enter custom schema name:").ask()
         
         name = questionary.text("Enter migration name:").ask()
@@ -201,18 +227,32 @@ def handle(args):
         print_success(f"Migration file created: {migration_file}")
         return 0
     
+    # Nothing to do if the migration files haven't changed since the last
+    # successful run for this scope; --force always runs
+    scope = args.schema or "all"
+    fingerprint = migrations_fingerprint(config)
+    state = config.get_state()
+    if not args.force and state.get('migrations', {}).get(scope) == fingerprint:
+        print_success("Migrations are up to date; nothing to run.")
+        print_info("Use --force to run them anyway.")
+        return 0
+    
     # Backup database if not skipped
     if not args.skip_backup:
-        success, backup_path = backup_database(config)
+        success, backup_path = backup_database(config, compose)
         if not success:
             if not confirm("Continue without backup?", default=False):
                 print_info("Migration cancelled.")
                 return 1
     
     # Run migrations
-    if not run_migrations(config, args.schema):
+    if not run_migrations(config, args.schema, compose):
         return 1
     
+    # Remember what was applied so an unchanged rerun can be skipped
+    state.setdefault('migrations', {})[scope] = fingerprint
+    config.save_state(state)
+    
     print_section("Migration Complete")
     print_success("Database migrations completed successfully.")
     
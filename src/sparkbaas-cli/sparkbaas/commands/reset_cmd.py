@@ -1,12 +1,15 @@
 import os
 import sys
+import stat
+import functools
 import shutil
 import subprocess
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 from sparkbaas.core.compose import DockerCompose
 from sparkbaas.core.config import Config
-from sparkbaas.core.utils import ensure_dir
+from sparkbaas.core.utils import ensure_dir, run_timestamp
 from sparkbaas.ui.console import (
     console, print_banner, print_step, print_success, 
     print_error, print_warning, print_info, print_section, confirm
@@ -24,17 +27,34 @@ def setup_parser(parser):
     )
     return parser
 
-def backup_env_file(config):
-    """Backup the .env file if it exists"""
+def backup_env_file(config, link=False):
+    """
+    Backup the .env file if it exists
+    
+    Args:
+        config: Config instance
+        link: Hardlink the backup instead of copying it. Only safe when the
+            original is removed afterwards, since in-place edits to a linked
+            .env would also change the backup.
+            
+    Returns:
+        True if a backup was made, False if there was no .env file
+    """
     env_file = config.env_file
     
     if env_file.exists():
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        timestamp = run_timestamp("%Y%m%d%H%M%S")
         backup_file = env_file.with_name(f".env.backup-{timestamp}")
         
         print_step(f"Backing up environment file to {backup_file.name}")
-        shutil.copy2(env_file, backup_file)
+        if link:
+            try:
+                os.link(env_file, backup_file)
+            except OSError:
+                # Hardlinks unsupported here; fall back to a real copy
+                shutil.copy2(env_file, backup_file)
+        else:
+            shutil.copy2(env_file, backup_file)
         print_success("Environment file backed up")
         return True
     
@@ -53,6 +73,40 @@ def remove_env_file(config):
     
     return False
 
+@functools.lru_cache(maxsize=None)
+def _docker_client():
+    """
+    Get a Docker SDK client shared by the reset steps
+    
+    Talking to the daemon over one API connection avoids starting a docker
+    CLI process per call. The SDK comes with docker-compose, but is imported
+    lazily and treated as optional.
+    
+    Returns:
+        docker.DockerClient, or None if the SDK is missing or the daemon
+        can't be reached (callers then fall back to the docker CLI)
+    """
+    try:
+        import docker
+        return docker.from_env()
+    except Exception:
+        return None
+
+def _remove_all(resources, **kwargs):
+    """
+    Remove Docker SDK resources, ignoring individual failures like the CLI
+    fallbacks do
+    
+    Args:
+        resources: Containers, volumes or networks from the SDK
+        **kwargs: Arguments for each resource's remove() call
+    """
+    for resource in resources:
+        try:
+            resource.remove(**kwargs)
+        except Exception:
+            pass
+
 def stop_and_remove_containers(config):
     """Stop and remove all SparkBaaS containers"""
     print_step("Stopping and removing SparkBaaS containers")
@@ -75,20 +129,23 @@ def stop_and_remove_containers(config):
         # Try direct Docker commands as fallback
         try:
             print_info("Trying direct Docker commands...")
-            subprocess.run(
-                ["docker", "ps", "-a", "--filter", "name=sparkbaas", "-q"],
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=False
-            )
-            container_ids = subprocess.run(
-                ["docker", "ps", "-a", "--filter", "name=sparkbaas", "-q"],
-                capture_output=True, text=True, check=False
-            ).stdout.strip()
+            client = _docker_client()
+            if client is not None:
+                containers = client.containers.list(all=True, filters={"name": "sparkbaas"})
+                _remove_all(containers, force=True)
+            else:
+                containers = subprocess.run(
+                    ["docker", "ps", "-a", "--filter", "name=sparkbaas", "--format", "{{.ID}}"],
+                    capture_output=True, text=True, check=False
+                ).stdout.splitlines()
+                
+                if containers:
+                    subprocess.run(
+                        ["docker", "rm", "-f"] + containers,
+                        stderr=subprocess.PIPE, stdout=subprocess.PIPE, check=False
+                    )
             
-            if container_ids:
-                subprocess.run(
-                    ["docker", "rm", "-f"] + container_ids.split('\n'),
-                    stderr=subprocess.PIPE, stdout=subprocess.PIPE, check=False
-                )
+            if containers:
                 print_success("Containers removed with direct Docker commands")
         except Exception as docker_err:
             print_warning(f"Docker fallback failed: {str(docker_err)}")
@@ -101,20 +158,27 @@ def remove_docker_volumes(config):
     
     try:
         # Get all volumes containing "sparkbaas" in their name
-        result = subprocess.run(
-            ["docker", "volume", "ls", "--filter", "name=sparkbaas", "-q"],
-            capture_output=True, text=True, check=True
-        )
-        
-        volumes = result.stdout.strip().split('\n')
-        volumes = [v for v in volumes if v]
+        client = _docker_client()
+        if client is not None:
+            volumes = client.volumes.list(filters={"name": "sparkbaas"})
+        else:
+            result = subprocess.run(
+                ["docker", "volume", "ls", "--filter", "name=sparkbaas", "-q"],
+                capture_output=True, text=True, check=True
+            )
+            
+            volumes = result.stdout.strip().split('\n')
+            volumes = [v for v in volumes if v]
         
         if volumes:
             # Remove the volumes
-            subprocess.run(
-                ["docker", "volume", "rm"] + volumes,
-                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False
-            )
+            if client is not None:
+                _remove_all(volumes)
+            else:
+                subprocess.run(
+                    ["docker", "volume", "rm"] + volumes,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False
+                )
             print_success(f"Removed {len(volumes)} Docker volumes")
         else:
             print_info("No SparkBaaS Docker volumes found")
@@ -130,18 +194,25 @@ def remove_docker_networks(config):
     
     try:
         # Get all networks containing "sparkbaas" in their name
-        result = subprocess.run(
-            ["docker", "network", "ls", "--filter", "name=sparkbaas", "--format", "{{.Name}}"],
-            capture_output=True, text=True, check=True
-        )
-        
-        networks = result.stdout.strip().split('\n')
-        networks = [n for n in networks if n]
+        client = _docker_client()
+        if client is not None:
+            networks = client.networks.list(filters={"name": "sparkbaas"})
+        else:
+            result = subprocess.run(
+                ["docker", "network", "ls", "--filter", "name=sparkbaas", "--format", "{{.Name}}"],
+                capture_output=True, text=True, check=True
+            )
+            
+            networks = result.stdout.strip().split('\n')
+            networks = [n for n in networks if n]
         
         if networks:
-            for network in networks:
+            # Remove the networks
+            if client is not None:
+                _remove_all(networks)
+            else:
                 subprocess.run(
-                    ["docker", "network", "rm", network],
+                    ["docker", "network", "rm"] + networks,
                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False
                 )
             print_success(f"Removed {len(networks)} Docker networks")
@@ -153,8 +224,57 @@ def remove_docker_networks(config):
         print_warning(f"Failed to remove Docker networks: {str(e)}")
         return False
 
+def _chmod_and_retry(func, path, _exc):
+    """
+    shutil.rmtree error handler that grants the owner rwx and retries once
+    
+    Removing an entry needs write access to its parent and listing a
+    directory needs read access to it, so both are made accessible before
+    the failed operation is retried. If we don't own the files the chmod
+    itself fails and the error propagates.
+    """
+    for target in (os.path.dirname(path), path):
+        if not os.path.islink(target):
+            os.chmod(target, os.stat(target).st_mode | stat.S_IRWXU)
+    func(path)
+
+def _rmtree(path):
+    """Remove a directory tree, fixing owner permissions along the way"""
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=_chmod_and_retry)
+    else:
+        shutil.rmtree(path, onerror=_chmod_and_retry)
+
+def _remove_trash(trash):
+    """
+    Delete a renamed-away data directory in the background
+    
+    Prints nothing, so it can't interleave with the rest of the reset;
+    handle() reports the result once the deletions have finished.
+    
+    Returns:
+        True if the directory was removed, False otherwise
+    """
+    try:
+        _rmtree(trash)
+    except Exception:
+        # Non-interactive sudo only: a password prompt from a background
+        # thread would interleave with the rest of the reset
+        return shutil.which("sudo") is not None and subprocess.run(
+            ["sudo", "-n", "rm", "-rf", str(trash)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False
+        ).returncode == 0
+    return True
+
 def clear_data_directories(config):
-    """Clear persistent data directories"""
+    """
+    Clear persistent data directories
+    
+    Returns:
+        List of (trash path, future) pairs for the directories still being
+        deleted in the background; each future's result is True once the
+        path is gone
+    """
     print_step("Clearing persistent data directories")
     
     data_dir = config.get_data_dir()
@@ -167,14 +287,34 @@ def clear_data_directories(config):
         data_dir / "functions",
     ]
     
+    # Directories are renamed out of the way and deleted by a background
+    # thread, so a large PGDATA doesn't hold up the rest of the reset
+    trash_remover = ThreadPoolExecutor(max_workers=1)
+    pending = []
+    trash_suffix = f".trash-{os.getpid()}-{run_timestamp('%Y%m%d%H%M%S')}"
+    
     for directory in directories:
+        # Pick up trash left behind by an interrupted reset
+        for leftover in directory.parent.glob(f"{directory.name}.trash-*"):
+            pending.append((leftover, trash_remover.submit(_remove_trash, leftover)))
+        
         if directory.exists():
             try:
-                # Remove directory contents
-                shutil.rmtree(directory)
+                try:
+                    trash = directory.with_name(directory.name + trash_suffix)
+                    os.rename(directory, trash)
+                except OSError:
+                    # Not renameable (e.g. a mount point), delete in place
+                    _rmtree(directory)
+                    trash = None
+                else:
+                    pending.append((trash, trash_remover.submit(_remove_trash, trash)))
                 # Recreate empty directory
                 directory.mkdir(parents=True, exist_ok=True)
-                print_success(f"Cleared directory: {directory.relative_to(config.project_root)}")
+                if trash is None:
+                    print_success(f"Cleared directory: {directory.relative_to(config.project_root)}")
+                else:
+                    print_info(f"Moved aside for deletion: {directory.relative_to(config.project_root)}")
             except Exception as e:
                 print_warning(f"Failed to clear directory {directory.name}: {str(e)}")
                 try:
@@ -191,7 +331,8 @@ def clear_data_directories(config):
             directory.mkdir(parents=True, exist_ok=True)
             print_info(f"Created directory: {directory.relative_to(config.project_root)}")
     
-    return True
+    trash_remover.shutdown(wait=False)
+    return pending
 
 def reset_state(config):
     """Reset the SparkBaaS state"""
@@ -230,25 +371,40 @@ def handle(args):
             return 0
     
     # Backup and remove .env file (if requested)
-    backup_env_file(config)
+    backup_env_file(config, link=not args.keep_env)
     if not args.keep_env:
         remove_env_file(config)
     
     # Stop and remove containers
-    stop_and_remove_containers(config)
+    containers_removed = stop_and_remove_containers(config)
     
-    # Remove Docker volumes
-    remove_docker_volumes(config)
+    # 'down --volumes' already removed the compose volumes, so only look for
+    # leftover volumes when it failed
+    steps = [remove_docker_networks, clear_data_directories]
+    if not containers_removed:
+        steps.insert(0, remove_docker_volumes)
     
-    # Remove Docker networks
-    remove_docker_networks(config)
-    
-    # Clear data directories
-    clear_data_directories(config)
+    # With the containers gone, the remaining steps are independent of each
+    # other, so run them concurrently
+    with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+        futures = {step: executor.submit(step, config) for step in steps}
+    for future in futures.values():
+        future.result()
     
     # Reset state
     reset_state(config)
     
+    # Wait for the old data directories to be deleted, so nothing is
+    # reported as wiped while it is still on disk
+    pending = futures[clear_data_directories].result()
+    if pending:
+        print_step("Deleting old data directories")
+        leftovers = [trash for trash, future in pending if not future.result()]
+        for trash in leftovers:
+            print_warning(f"Could not delete {trash}. Remove it with: sudo rm -rf {trash}")
+        if not leftovers:
+            print_success("Old data directories deleted")
+    
     print_section("Reset Complete")
     print_success("SparkBaaS environment has been reset.")
     print_info("To reinitialize SparkBaaS, run: spark init")
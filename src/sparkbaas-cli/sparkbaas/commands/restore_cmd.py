@@ -2,8 +2,10 @@ import os
 import sys
 from pathlib import Path
 import time
+import shutil
 import subprocess
-import glob
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
 
 from sparkbaas.core.compose import DockerCompose
 from sparkbaas.core.config import Config
@@ -12,6 +14,12 @@ from sparkbaas.ui.console import (
     print_warning, print_info, print_section, confirm, select
 )
 
+# Chunk size for decompressing backups (4 MiB, in line with kernel readahead)
+DECOMPRESS_CHUNK_SIZE = 1 << 22
+
+# Regular files per extraction task when unpacking .tar archives in parallel
+EXTRACT_BATCH_SIZE = 256
+
 def setup_parser(parser):
     """Set up command-line arguments for restore command"""
     parser.add_argument(
@@ -39,25 +47,30 @@ def find_latest_backup(backup_dir, prefix):
     Returns:
         Path to latest backup file or None if not found
     """
-    pattern = os.path.join(backup_dir, f"{prefix}_*.sql*")
-    backup_files = glob.glob(pattern)
-    
-    if not backup_files:
-        # Try compressed files
-        pattern = os.path.join(backup_dir, f"{prefix}_*.sql.gz")
-        backup_files = glob.glob(pattern)
-    
-    if not backup_files:
-        # Try tar files for file backups
-        pattern = os.path.join(backup_dir, f"{prefix}_*.tar*")
-        backup_files = glob.glob(pattern)
-        
-    if not backup_files:
+    # One directory pass; DirEntry caches the stat result, so each candidate
+    # costs a single stat for its mtime. Dumps (prefix_*.sql*) take priority
+    # over archives (prefix_*.tar*).
+    name_prefix = f"{prefix}_"
+    latest = {".sql": None, ".tar": None}
+    try:
+        with os.scandir(backup_dir) as entries:
+            for entry in entries:
+                if not entry.name.startswith(name_prefix) or not entry.is_file():
+                    continue
+                rest = entry.name[len(name_prefix):]
+                for marker, current in latest.items():
+                    if marker in rest:
+                        mtime = entry.stat().st_mtime
+                        if current is None or mtime > current[0]:
+                            latest[marker] = (mtime, entry.path)
+                        break
+    except FileNotFoundError:
         return None
-        
-    # Sort by modification time (newest first)
-    backup_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-    return Path(backup_files[0])
+    
+    for found in latest.values():
+        if found is not None:
+            return Path(found[1])
+    return None
 
 def select_backup(backup_dir, backup_type):
     """
@@ -72,28 +85,37 @@ def select_backup(backup_dir, backup_type):
     """
     # Find files matching the pattern
     if backup_type == "postgres":
-        pattern = os.path.join(backup_dir, "postgres_*.sql*")
+        pattern = "postgres_*.sql*"
         prefix = "PostgreSQL"
     else:
-        pattern = os.path.join(backup_dir, "files_*.tar*")
+        pattern = "files_*.tar*"
         prefix = "Files"
-        
-    backup_files = glob.glob(pattern)
     
-    if not backup_files:
+    # One stat per file (cached on the DirEntry) serves the sort, the
+    # timestamp and the size
+    try:
+        with os.scandir(backup_dir) as entries:
+            backups = [
+                (entry.stat(), entry.path) for entry in entries
+                if fnmatch.fnmatch(entry.name, pattern) and entry.is_file()
+            ]
+    except FileNotFoundError:
+        backups = []
+    
+    if not backups:
         print_warning(f"No {backup_type} backup files found.")
         return None
         
     # Sort by modification time (newest first)
-    backup_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
+    backups.sort(key=lambda backup: backup[0].st_mtime_ns, reverse=True)
+    backup_files = [path for _, path in backups]
     
     # Format choices with timestamps
     choices = []
-    for file_path in backup_files:
+    for st, file_path in backups:
         filename = os.path.basename(file_path)
-        mtime = os.path.getmtime(file_path)
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(mtime))
-        size_mb = os.path.getsize(file_path) / (1024 * 1024)
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(st.st_mtime))
+        size_mb = st.st_size / (1024 * 1024)
         choices.append(f"{filename} ({timestamp}, {size_mb:.2f}MB)")
     
     # Add cancel option
@@ -112,13 +134,37 @@ def select_backup(backup_dir, backup_type):
     index = choices.index(selected)
     return Path(backup_files[index])
 
-def restore_postgres(config, backup_file):
+def _psql_exec(container_id, *statements, database="postgres"):
+    """
+    Run SQL statements with psql inside a running postgres container
+    
+    Uses 'docker exec' against the existing container rather than starting a
+    one-off container, and stops at the first failing statement.
+    
+    Args:
+        container_id: ID of the running postgres container
+        *statements: SQL statements, each passed as its own -c
+        database: Database to connect to
+        
+    Returns:
+        CompletedProcess object
+    """
+    cmd = [
+        "docker", "exec", container_id,
+        "psql", "-U", "postgres", "-d", database, "-v", "ON_ERROR_STOP=1"
+    ]
+    for statement in statements:
+        cmd.extend(["-c", statement])
+    return subprocess.run(cmd, check=True)
+
+def restore_postgres(config, backup_file, compose=None):
     """
     Restore PostgreSQL database
     
     Args:
         config: Config instance
         backup_file: Path to backup file
+        compose: DockerCompose wrapper to reuse (a new one is created if omitted)
         
     Returns:
         True if successful, False otherwise
@@ -126,12 +172,12 @@ def restore_postgres(config, backup_file):
     print_step(f"Restoring PostgreSQL database from {backup_file}...")
     
     # Get Docker Compose wrapper
-    compose = DockerCompose()
+    if compose is None:
+        compose = DockerCompose()
     
     try:
         # Check if postgres container is running
-        ps_output = compose.run("ps", capture_output=True).stdout
-        if "postgres" not in ps_output:
+        if not compose.service_running("postgres"):
             print_warning("PostgreSQL container is not running.")
             if not confirm("Start PostgreSQL container for restore?", default=True):
                 print_info("PostgreSQL restore cancelled.")
@@ -143,68 +189,44 @@ def restore_postgres(config, backup_file):
             time.sleep(5)
         
         # Get container ID
-        container_id = subprocess.run(
-            ["docker", "compose", "-f", str(compose.compose_file), "ps", "-q", "postgres"],
-            capture_output=True, text=True
-        ).stdout.strip()
+        container_id = compose.container_id("postgres")
         
         if not container_id:
             print_error("Failed to get PostgreSQL container ID.")
             return False
         
-        # Decompress if needed
-        is_compressed = str(backup_file).endswith('.gz')
-        if is_compressed:
-            print_info("Decompressing backup file...")
-            import gzip
-            import tempfile
-            
-            # Create temp file for decompressed backup
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.sql') as temp_file:
-                temp_path = temp_file.name
-                
-            with gzip.open(backup_file, 'rb') as f_in:
-                with open(temp_path, 'wb') as f_out:
-                    f_out.write(f_in.read())
-            
-            backup_file = temp_path
-        
-        # Copy backup file to container
-        print_info("Copying backup file to container...")
-        subprocess.run(
-            ["docker", "cp", str(backup_file), f"{container_id}:/tmp/restore.sql"],
-            check=True
-        )
-        
-        # Drop and recreate database
+        # Drop and recreate database in one psql session. Connect to
+        # template1 since the target database can't be dropped from a
+        # connection to itself.
         print_warning("Dropping existing database...")
-        compose.run_service(
-            service="postgres",
-            command="psql -U postgres -c 'SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE datname = \\'postgres\\' AND pid <> pg_backend_pid();'",
-            entrypoint=""
-        )
-        compose.run_service(
-            service="postgres",
-            command="psql -U postgres -c 'DROP DATABASE postgres;'",
-            entrypoint=""
-        )
-        compose.run_service(
-            service="postgres",
-            command="psql -U postgres -c 'CREATE DATABASE postgres;'",
-            entrypoint=""
+        _psql_exec(
+            container_id,
+            "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+            "WHERE datname = 'postgres' AND pid <> pg_backend_pid();",
+            "DROP DATABASE postgres;",
+            "CREATE DATABASE postgres;",
+            database="template1"
         )
         
-        # Restore from backup
+        # Restore from backup by streaming the dump (decompressed on the fly
+        # if needed) into psql in the running container, without a temp file
+        # or a copy into the container
         print_info("Restoring database...")
-        compose.run_service(
-            service="postgres",
-            command="psql -U postgres -d postgres -f /tmp/restore.sql",
-            entrypoint=""
-        )
+        if str(backup_file).endswith('.gz'):
+            import gzip
+            f_in = gzip.open(backup_file, 'rb')
+        else:
+            f_in = open(backup_file, 'rb')
+        
+        with f_in, subprocess.Popen(
+            ["docker", "exec", "-i", container_id, "psql", "-U", "postgres", "-d", "postgres"],
+            stdin=subprocess.PIPE
+        ) as proc:
+            shutil.copyfileobj(f_in, proc.stdin, length=DECOMPRESS_CHUNK_SIZE)
         
-        # Clean up temp file if created
-        if is_compressed:
-            os.unlink(temp_path)
+        if proc.returncode != 0:
+            print_error(f"psql failed with exit code {proc.returncode}")
+            return False
         
         print_success("PostgreSQL database restored successfully.")
         return True
@@ -212,13 +234,75 @@ def restore_postgres(config, backup_file):
         print_error(f"Failed to restore PostgreSQL database: {str(e)}")
         return False
 
-def restore_files(config, backup_file):
+def _extract_members(backup_file, members, data_dir, extract_kwargs):
+    """Extract a batch of members using a private handle on the archive"""
+    import tarfile
+    
+    with tarfile.open(backup_file, mode="r:") as tar:
+        for member in members:
+            tar.extract(member, path=data_dir, **extract_kwargs)
+
+def _create_member_dirs(members, files, data_dir):
+    """Create directory members and file parents inside data_dir serially"""
+    root = os.path.realpath(data_dir)
+    paths = {member.name for member in members if member.isdir()}
+    paths.update(os.path.dirname(member.name) for member in files)
+    
+    for name in sorted(paths):
+        target = os.path.realpath(os.path.join(root, name))
+        # Leave anything outside data_dir for the extraction filter to reject
+        if target == root or not target.startswith(root + os.sep):
+            continue
+        os.makedirs(target, exist_ok=True)
+
+def _extract_tar_parallel(backup_file, data_dir, extract_kwargs):
+    """
+    Extract an uncompressed tar archive, writing regular files concurrently
+    
+    An uncompressed archive can be read at any offset, so batches of regular
+    files are extracted by a thread pool, each worker with its own handle on
+    the archive. Every directory the files land in is created up front, so
+    workers never race to create the same parent. Directories and links are
+    extracted afterwards in one serial pass, so links find their targets and
+    directory permissions and times are applied last, as extractall() does.
+    Small archives are simply extracted serially.
+    
+    Args:
+        backup_file: Path to the .tar archive
+        data_dir: Directory to extract into
+        extract_kwargs: Extra arguments for extract() (e.g. filter)
+    """
+    import tarfile
+    
+    with tarfile.open(backup_file, mode="r:") as tar:
+        members = tar.getmembers()
+        files = [member for member in members if member.isreg()]
+        
+        if len(files) > EXTRACT_BATCH_SIZE:
+            batches = [
+                files[i:i + EXTRACT_BATCH_SIZE]
+                for i in range(0, len(files), EXTRACT_BATCH_SIZE)
+            ]
+            _create_member_dirs(members, files, data_dir)
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                futures = [
+                    executor.submit(_extract_members, backup_file, batch, data_dir, extract_kwargs)
+                    for batch in batches
+                ]
+            for future in futures:
+                future.result()
+            members = [member for member in members if not member.isreg()]
+        
+        tar.extractall(path=data_dir, members=members, **extract_kwargs)
+
+def restore_files(config, backup_file, compose=None):
     """
     Restore file storage
     
     Args:
         config: Config instance
         backup_file: Path to backup file
+        compose: DockerCompose wrapper to reuse (a new one is created if omitted)
         
     Returns:
         True if successful, False otherwise
@@ -229,54 +313,57 @@ def restore_files(config, backup_file):
         # Get data directory
         data_dir = config.get_data_dir()
         
+        # zstandard is optional, so check for it before stopping anything
+        zstandard = None
+        if str(backup_file).endswith('.zst'):
+            try:
+                import zstandard
+            except ImportError:
+                print_error("Restoring .zst backups requires zstandard: pip install 'sparkbaas[zstd]'")
+                return False
+        
         # Check if we need to stop services
-        compose = DockerCompose()
-        ps_output = compose.run("ps", capture_output=True).stdout
+        if compose is None:
+            compose = DockerCompose()
+        storage_services = [
+            service for service in ("minio", "storage")
+            if compose.service_running(service)
+        ]
         
-        if "minio" in ps_output or "storage" in ps_output:
+        if storage_services:
             print_warning("Storage services are running.")
             if not confirm("Stop storage services for restore?", default=True):
                 print_info("File storage restore cancelled.")
                 return False
                 
             print_info("Stopping storage services...")
-            if "minio" in ps_output:
-                compose.stop(services=["minio"])
-            if "storage" in ps_output:
-                compose.stop(services=["storage"])
-        
-        # Decompress if needed
-        is_compressed = str(backup_file).endswith('.gz')
-        if is_compressed:
-            print_info("Decompressing backup file...")
-            import gzip
-            import tempfile
-            
-            # Create temp file for decompressed backup
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.tar') as temp_file:
-                temp_path = temp_file.name
-                
-            with gzip.open(backup_file, 'rb') as f_in:
-                with open(temp_path, 'wb') as f_out:
-                    f_out.write(f_in.read())
-            
-            backup_file = temp_path
+            compose.stop(services=storage_services)
         
-        # Extract archive
+        # Extract archive in a single streaming pass: tarfile decompresses
+        # gzip/bzip2/xz itself ("r|*") and zstd goes through zstandard, so
+        # compressed archives are never expanded to a temp file first
         print_info("Extracting backup archive...")
-        from tarfile import TarFile
+        import tarfile
         
-        with TarFile.open(backup_file, "r") as tar:
-            tar.extractall(path=data_dir)
+        # Refuse absolute paths, links escaping data_dir and device files
+        # where the running Python supports extraction filters
+        extract_kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
         
-        # Clean up temp file if created
-        if is_compressed:
-            os.unlink(temp_path)
+        if str(backup_file).endswith('.zst'):
+            with open(backup_file, 'rb') as raw:
+                with zstandard.ZstdDecompressor().stream_reader(raw) as stream:
+                    with tarfile.open(fileobj=stream, mode="r|") as tar:
+                        tar.extractall(path=data_dir, **extract_kwargs)
+        elif str(backup_file).endswith('.tar'):
+            _extract_tar_parallel(backup_file, data_dir, extract_kwargs)
+        else:
+            with tarfile.open(backup_file, mode="r|*") as tar:
+                tar.extractall(path=data_dir, **extract_kwargs)
         
         print_success("File storage restored successfully.")
         
         # Restart services
-        if "minio" in ps_output or "storage" in ps_output:
+        if storage_services:
             print_info("Restarting storage services...")
             compose.up(detached=True)
         
@@ -304,6 +391,10 @@ def handle(args):
             print_info("Restore cancelled.")
             return 0
     
+    # One wrapper for the whole restore, so the running-services lookup is
+    # shared and only refreshed after services are started or stopped
+    compose = DockerCompose()
+    
     # Default backup directory
     backup_dir = config.project_root / "src" / "data" / "backups"
     
@@ -320,7 +411,7 @@ def handle(args):
                 postgres_backup = select_backup(backup_dir, "postgres")
     
     if postgres_backup:
-        if restore_postgres(config, postgres_backup):
+        if restore_postgres(config, postgres_backup, compose):
             print_success("PostgreSQL database restored successfully.")
         else:
             print_error("Failed to restore PostgreSQL database.")
@@ -338,7 +429,7 @@ def handle(args):
                 files_backup = select_backup(backup_dir, "files")
     
     if files_backup:
-        if restore_files(config, files_backup):
+        if restore_files(config, files_backup, compose):
             print_success("File storage restored successfully.")
         else:
             print_error("Failed to restore file storage.")
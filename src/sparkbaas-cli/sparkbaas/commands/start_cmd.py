@@ -29,34 +29,68 @@ def setup_parser(parser):
     )
     return parser
 
-def run_migrations(config):
-    """Run database migrations"""
+def run_migrations(config, compose=None):
+    """
+    Run database migrations
+    
+    The scripts run via 'docker compose exec' in a postgres container that is
+    started (detached) if needed, rather than in a one-off container wrapped
+    in a shell.
+    
+    Args:
+        config: Config instance
+        compose: DockerCompose wrapper to reuse (a new one is created if omitted)
+        
+    Returns:
+        True if successful, False otherwise
+    """
     print_step("Running database migrations...")
     
     # Get Docker Compose wrapper
-    compose = DockerCompose()
+    if compose is None:
+        compose = DockerCompose()
     
     try:
-        # Run migrations using the postgres service
-        compose.run_service(
-            service="postgres", 
-            command="sh -c 'cd /docker-entrypoint-initdb.d && ./init-db.sh'",
-            entrypoint=""
-        )
+        if not compose.service_running("postgres"):
+            compose.up(detached=True, services=["postgres"])
+        
+        if not compose.wait_for_service("postgres", ["pg_isready", "-U", "postgres"]):
+            print_error("PostgreSQL did not become ready in time.")
+            return False
+        
+        # Run migrations in the postgres container
+        compose.run("exec", "-T", "-w", "/docker-entrypoint-initdb.d", "postgres", "./init-db.sh")
         print_success("Migrations completed successfully.")
         return True
     except Exception as e:
         print_error(f"Failed to run migrations: {str(e)}")
         return False
 
-def start_services(args):
-    """Start SparkBaaS services"""
+def start_services(args, compose=None):
+    """
+    Start SparkBaaS services
+    
+    Args:
+        args: Parsed command-line arguments
+        compose: DockerCompose wrapper to reuse (a new one is created if omitted)
+        
+    Returns:
+        True if successful, False otherwise
+    """
     print_step("Starting services...")
     
     # Get Docker Compose wrapper
-    compose = DockerCompose()
+    if compose is None:
+        compose = DockerCompose()
     
     try:
+        # A single existing service can be started directly, without compose
+        # working out the whole project
+        if (args.services and len(args.services) == 1 and not args.build
+                and not args.attach and compose.start_existing(args.services[0])):
+            print_success("Services started successfully.")
+            return True
+        
         # Start services
         compose.up(detached=not args.attach, services=args.services, build=args.build)
         print_success("Services started successfully.")
@@ -70,17 +104,18 @@ def display_access_info(config):
     print_section("Access Information")
     
     # Get URLs and credentials from config
-    postgres_host = config.get_env_var("POSTGRES_HOST", "localhost")
-    postgres_port = config.get_env_var("POSTGRES_PORT", "5432")
-    postgres_user = config.get_env_var("POSTGRES_USER", "postgres")
-    postgres_db = config.get_env_var("POSTGRES_DB", "postgres")
+    env = config.get_env_vars()
+    postgres_host = env.get("POSTGRES_HOST", "localhost")
+    postgres_port = env.get("POSTGRES_PORT", "5432")
+    postgres_user = env.get("POSTGRES_USER", "postgres")
+    postgres_db = env.get("POSTGRES_DB", "postgres")
     
     # Keycloak info
-    keycloak_port = config.get_env_var("KEYCLOAK_PORT", "8080")
-    keycloak_user = config.get_env_var("KEYCLOAK_ADMIN", "admin")
+    keycloak_port = env.get("KEYCLOAK_PORT", "8080")
+    keycloak_user = env.get("KEYCLOAK_ADMIN", "admin")
     
     # API Gateway info
-    api_port = config.get_env_var("API_GATEWAY_PORT", "8000")
+    api_port = env.get("API_GATEWAY_PORT", "8000")
     
     # Create info panel
     info = []
@@ -120,13 +155,15 @@ def handle(args):
     
     print_section("Starting SparkBaaS")
     
+    compose = DockerCompose()
+    
     # Run migrations if not skipped
     if not args.no_migrations:
-        if not run_migrations(config):
+        if not run_migrations(config, compose):
             return 1
     
     # Start services
-    if not start_services(args):
+    if not start_services(args, compose):
         return 1
     
     # Display access information
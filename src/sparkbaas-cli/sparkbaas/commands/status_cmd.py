@@ -1,16 +1,13 @@
 import os
-import subprocess
-import json
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-from sparkbaas.core.compose import DockerCompose
-from sparkbaas.core.config import Config
+from sparkbaas.core.compose import get_compose
+from sparkbaas.core.config import get_config
 from sparkbaas.ui.console import (
     console, print_step, print_success, print_error, 
     print_warning, print_info, print_section
 )
-from rich.table import Table
-from rich.console import Console
 
 def setup_parser(parser):
     """Set up command-line arguments for status command"""
@@ -28,65 +25,47 @@ def setup_parser(parser):
     )
     return parser
 
-def parse_ps_output(output):
+def format_ports(publishers):
     """
-    Parse docker compose ps output into structured data
+    Format a container's published ports for display
     
     Args:
-        output: String output from docker-compose ps
+        publishers: 'Publishers' list from docker compose ps JSON output
         
     Returns:
-        List of dictionaries with service info
+        Comma-separated ports, e.g. "0.0.0.0:5432->5432/tcp"
     """
-    try:
-        # Try to get JSON output directly if using newer Docker Compose
-        cmd = ["docker", "compose", "ps", "--format", "json"]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            services = json.loads(result.stdout)
-            return services
-    except:
-        pass
-    
-    # Fallback to text parsing for older Docker Compose versions
-    services = []
-    lines = output.strip().split('\n')
-    
-    # Skip header line
-    if len(lines) <= 1:
-        return services
-    
-    # Parse each line
-    for line in lines[1:]:
-        parts = line.split()
-        if len(parts) >= 4:
-            service = {
-                "name": parts[0],
-                "state": parts[len(parts) - 2],
-                "health": parts[len(parts) - 1] if len(parts) > 3 else "",
-                "ports": " ".join([p for p in parts if ":" in p])
-            }
-            services.append(service)
-    
-    return services
+    # Ordered dict keys drop duplicates without rescanning the list
+    ports = {}
+    for publisher in publishers or ():
+        target = f"{publisher.get('TargetPort')}/{publisher.get('Protocol', 'tcp')}"
+        if publisher.get("PublishedPort"):
+            target = f"{publisher.get('URL', '')}:{publisher['PublishedPort']}->{target}"
+        ports[target] = None
+    return ", ".join(ports)
 
 def get_services_status(args):
     """
     Get status of services
     
-    Returns:
-        List of service status dicts
+    Containers are read from 'docker compose ps' as it prints them.
+    
+    Yields:
+        Service status dicts
     """
     # Get Docker Compose wrapper
-    compose = DockerCompose()
+    compose = get_compose()
     
     try:
-        output = compose.ps(services=args.services)
-        services = parse_ps_output(output)
-        return services
+        for container in compose.ps(services=args.services, stream=True):
+            yield {
+                "name": container.get("Name", ""),
+                "state": container.get("State", ""),
+                "health": container.get("Health", ""),
+                "ports": format_ports(container.get("Publishers"))
+            }
     except Exception as e:
         print_error(f"Failed to get service status: {str(e)}")
-        return []
 
 def show_logs(args):
     """Show logs for services"""
@@ -96,45 +75,41 @@ def show_logs(args):
     print_section("Service Logs")
     
     # Get Docker Compose wrapper
-    compose = DockerCompose()
+    compose = get_compose()
     
     try:
-        compose.logs(services=args.services, follow=False, tail=args.tail)
+        for line in compose.logs(services=args.services, follow=False, tail=args.tail, stream=True):
+            console.print(line, end="", markup=False, highlight=False)
     except Exception as e:
         print_error(f"Failed to get logs: {str(e)}")
 
-def get_system_info():
-    """Get system information"""
-    from sparkbaas.core.utils import get_os_type, get_available_memory_gb, get_cpu_cores
+def get_system_info(config=None):
+    """
+    Get system information
+    
+    Args:
+        config: Config instance; if given, Docker versions are cached in its
+            state directory across runs
+    """
+    from sparkbaas.core.utils import (
+        get_os_type, get_available_memory_gb, get_cpu_cores, get_docker_versions
+    )
+    
+    cache_file = config.state_dir / "docker_versions.json" if config else None
+    docker, docker_compose = get_docker_versions(cache_file)
     
-    info = {
+    return {
         "os": get_os_type(),
         "memory_gb": get_available_memory_gb(),
         "cpu_cores": get_cpu_cores(),
-        "docker": None,
-        "docker_compose": None
+        "docker": docker,
+        "docker_compose": docker_compose
     }
-    
-    # Get Docker version
-    try:
-        cmd = ["docker", "--version"]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        info["docker"] = result.stdout.strip()
-    except:
-        pass
-    
-    # Get Docker Compose version
-    try:
-        cmd = ["docker", "compose", "version"]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        info["docker_compose"] = result.stdout.strip()
-    except:
-        pass
-    
-    return info
 
 def display_status(services, config):
     """Display service status in a table"""
+    from rich.table import Table
+    
     # Create status table
     table = Table(title="SparkBaaS Service Status")
     table.add_column("Service", style="cyan")
@@ -142,11 +117,7 @@ def display_status(services, config):
     table.add_column("Health", style="magenta")
     table.add_column("Ports", style="yellow")
     
-    if not services:
-        print_warning("No services found.")
-        return
-    
-    # Add rows for each service
+    # Add rows for each service as it is read
     for service in services:
         name = service.get("name", "")
         state = service.get("state", "")
@@ -173,11 +144,17 @@ def display_status(services, config):
         
         table.add_row(name, state_display, health_display, ports)
     
+    if not table.row_count:
+        print_warning("No services found.")
+        return
+    
     # Print the table
     console.print(table)
 
 def display_system_info(info):
     """Display system information"""
+    from rich.table import Table
+    
     print_section("System Information")
     
     # Create info table
@@ -204,7 +181,7 @@ def display_system_info(info):
 
 def handle(args):
     """Handle status command"""
-    config = Config()
+    config = get_config()
     
     # Check if initialized
     if not config.is_initialized():
@@ -214,18 +191,21 @@ def handle(args):
     
     print_section("SparkBaaS Status")
     
-    # Get service status
-    services = get_services_status(args)
-    
-    # Display service status
-    display_status(services, config)
-    
-    # Show logs if requested
-    if args.logs:
-        show_logs(args)
-    
-    # Display system information
-    system_info = get_system_info()
-    display_system_info(system_info)
+    # Gather system information in the background while services are listed
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        system_info = executor.submit(get_system_info, config)
+        
+        # Get service status
+        services = get_services_status(args)
+        
+        # Display service status
+        display_status(services, config)
+        
+        # Show logs if requested
+        if args.logs:
+            show_logs(args)
+        
+        # Display system information
+        display_system_info(system_info.result())
     
     return 0
\ No newline at end of file
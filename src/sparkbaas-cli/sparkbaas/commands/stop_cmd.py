@@ -1,8 +1,8 @@
 import os
 from pathlib import Path
 
-from sparkbaas.core.compose import DockerCompose
-from sparkbaas.core.config import Config
+from sparkbaas.core.compose import get_compose
+from sparkbaas.core.config import get_config
 from sparkbaas.ui.console import (
     console, print_step, print_success, print_error, 
     print_warning, print_info, print_section, confirm
@@ -29,7 +29,7 @@ def stop_services(args):
     print_step("Stopping services...")
     
     # Get Docker Compose wrapper
-    compose = DockerCompose()
+    compose = get_compose()
     
     try:
         # If specific services are provided, use stop
@@ -57,7 +57,7 @@ def stop_services(args):
 
 def handle(args):
     """Handle stop command"""
-    config = Config()
+    config = get_config()
     
     # Check if initialized
     if not config.is_initialized():
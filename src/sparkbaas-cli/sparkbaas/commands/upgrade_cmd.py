@@ -6,14 +6,12 @@ import subprocess
 import json
 import time
 
-from sparkbaas.core.compose import DockerCompose
-from sparkbaas.core.config import Config
-from sparkbaas.core.utils import ensure_dir, load_json, save_json
+from sparkbaas.core.compose import get_compose
+from sparkbaas.core.config import get_config
 from sparkbaas.ui.console import (
     console, print_step, print_success, print_error, 
     print_warning, print_info, print_section, confirm, select
 )
-from rich.table import Table
 from sparkbaas import __version__ as current_version
 
 def setup_parser(parser):
@@ -104,6 +102,8 @@ def print_upgrade_status():
     """
     Print upgrade status table
     """
+    from rich.table import Table
+    
     versions = get_platform_versions()
     upgrades = check_for_upgrades()
     
@@ -131,7 +131,19 @@ def print_upgrade_status():
     # Print the table
     console.print(table)
 
-def upgrade_component(component, config, force=False):
+def component_services(component):
+    """
+    Get the compose services belonging to a component
+    
+    Args:
+        component: Component name
+        
+    Returns:
+        List of service names
+    """
+    return ["gateway"] if component == "api" else [component]
+
+def upgrade_component(component, config, force=False, compose=None):
     """
     Upgrade a specific component
     
@@ -139,56 +151,77 @@ def upgrade_component(component, config, force=False):
         component: Component name to upgrade
         config: Config instance
         force: Whether to force upgrade without confirmation
+        compose: DockerCompose wrapper to reuse (defaults to the shared one)
         
     Returns:
         True if successful, False otherwise
     """
-    versions = get_platform_versions()
-    
     if component == "platform":
         print_info("Upgrading platform components...")
         # In a real implementation, this would update the CLI itself
         print_warning("Platform upgrade would be performed here.")
         return True
     
-    component_info = versions["components"].get(component)
-    if not component_info:
-        print_error(f"Unknown component: {component}")
-        return False
+    return upgrade_components([component], config, force, compose)
+
+def upgrade_components(components, config, force=False, compose=None):
+    """
+    Upgrade several components at once
     
-    if component_info["current"] == component_info["latest"]:
-        print_info(f"Component '{component}' is already up to date.")
-        return True
+    Each component is checked and confirmed separately, then the images of
+    all confirmed components are pulled and their services recreated with a
+    single 'docker compose up --pull always --no-deps --force-recreate', which
+    leaves the services they depend on alone.
     
-    print_step(f"Upgrading {component} from {component_info['current']} to {component_info['latest']}...")
+    Args:
+        components: Component names to upgrade
+        config: Config instance
+        force: Whether to force upgrade without confirmation
+        compose: DockerCompose wrapper to reuse (defaults to the shared one)
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    versions = get_platform_versions()
     
-    if not force:
-        if not confirm(f"Continue with {component} upgrade?", default=True):
-            print_info(f"{component.capitalize()} upgrade cancelled.")
-            return True
+    selected = []
+    for component in components:
+        component_info = versions["components"].get(component)
+        if not component_info:
+            print_error(f"Unknown component: {component}")
+            return False
+        
+        if component_info["current"] == component_info["latest"]:
+            print_info(f"Component '{component}' is already up to date.")
+            continue
+        
+        print_step(f"Upgrading {component} from {component_info['current']} to {component_info['latest']}...")
+        
+        if not force:
+            if not confirm(f"Continue with {component} upgrade?", default=True):
+                print_info(f"{component.capitalize()} upgrade cancelled.")
+                continue
+        
+        selected.append(component)
     
-    # In a real implementation, this would:
-    # 1. Pull new images for the component
-    # 2. Stop the affected services
-    # 3. Apply any migrations/changes
-    # 4. Start the updated services
-    compose = DockerCompose()
+    if not selected:
+        return True
+    
+    # In a real implementation, this would also apply any migrations/changes
+    # between pulling the new images and starting the updated services
+    if compose is None:
+        compose = get_compose()
     
     try:
-        # Example implementation for demonstration purposes
-        print_info(f"Pulling latest {component} images...")
-        # This would pull the specific images for the component
-        compose.run("pull", services=[component] if component != "api" else ["gateway"], capture_output=True)
-        
-        print_info(f"Restarting {component} services...")
-        # This would restart the specific services for the component
-        compose.stop(services=[component] if component != "api" else ["gateway"])
-        compose.up(services=[component] if component != "api" else ["gateway"], detached=True)
+        print_info(f"Pulling latest images and restarting services for: {', '.join(selected)}...")
+        services = [service for component in selected for service in component_services(component)]
+        compose.up(services=services, detached=True, pull="always", no_deps=True, force_recreate=True)
         
-        print_success(f"{component.capitalize()} upgraded successfully to version {component_info['latest']}")
+        for component in selected:
+            print_success(f"{component.capitalize()} upgraded successfully to version {versions['components'][component]['latest']}")
         return True
     except Exception as e:
-        print_error(f"Failed to upgrade {component}: {str(e)}")
+        print_error(f"Failed to upgrade {', '.join(selected)}: {str(e)}")
         return False
 
 def perform_backup(config):
@@ -219,7 +252,7 @@ def perform_backup(config):
 
 def handle(args):
     """Handle upgrade command"""
-    config = Config()
+    config = get_config()
     
     # Check if initialized
     if not config.is_initialized():
@@ -236,9 +269,8 @@ def handle(args):
     print_section("Upgrade SparkBaaS")
     
     # Check if services are running
-    compose = DockerCompose()
-    ps_output = compose.run("ps", capture_output=True).stdout
-    services_running = len(ps_output.strip()) > 0
+    compose = get_compose()
+    services_running = bool(compose.running_services())
     
     # Show current status
     print_upgrade_status()
@@ -263,7 +295,7 @@ def handle(args):
     
     # Handle component-specific upgrade
     if args.component != "all":
-        return 0 if upgrade_component(args.component, config, args.force) else 1
+        return 0 if upgrade_component(args.component, config, args.force, compose) else 1
     
     # Perform platform upgrade if available
     if platform_upgrade:
@@ -272,11 +304,8 @@ def handle(args):
             return 1
     
     # Perform component upgrades
-    success = True
-    for component, needs_upgrade in upgrades["components"].items():
-        if needs_upgrade:
-            if not upgrade_component(component, config, args.force):
-                success = False
+    pending = [component for component, needs_upgrade in upgrades["components"].items() if needs_upgrade]
+    success = upgrade_components(pending, config, args.force, compose)
     
     if success:
         print_success("Upgrade completed successfully!")
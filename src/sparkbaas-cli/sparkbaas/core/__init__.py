@@ -2,18 +2,23 @@
 SparkBaaS CLI core functionality
 """
 
-from sparkbaas.core.compose import DockerCompose
-from sparkbaas.core.config import Config
+from sparkbaas.core.compose import DockerCompose, get_compose
+from sparkbaas.core.config import Config, get_config
 from sparkbaas.core.utils import (
     get_project_root,
     ensure_dir,
     copy_template,
     load_yaml,
     save_yaml,
+    invalidate_yaml_cache,
     load_json,
     save_json,
+    atomic_write_bytes,
+    run_timestamp,
     is_docker_available,
     is_docker_compose_available,
+    is_docker_daemon_running,
+    get_docker_versions,
     get_os_type,
     get_available_memory_gb,
     get_cpu_cores
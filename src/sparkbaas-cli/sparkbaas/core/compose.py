@@ -1,17 +1,67 @@
 import os
+import re
+import json
+import shutil
+import functools
 import subprocess
 import sys
+import time
 import platform
 from pathlib import Path
 
 from sparkbaas.ui.console import console, print_info, print_error, print_success
-from sparkbaas.core.utils import get_project_root
+from sparkbaas.core.utils import get_project_root, get_docker_versions
+
+_VERSION_RE = re.compile(r"\d+(?:\.\d+)+")
+
+# Arguments for the common up()/down() calls with default options
+_UP_DETACHED = ("up", "-d")
+_DOWN_DEFAULT = ("down", "--remove-orphans")
+
+# Absolute path of the docker CLI, resolved once so commands skip the PATH
+# search
+_DOCKER_BIN = shutil.which("docker") or "docker"
+
+# Error for a Compose that can't list containers as JSON
+_JSON_PS_REQUIRED = "Docker Compose v2 or later is required to list services"
+
+def _parse_ps_json(output):
+    """
+    Parse 'docker compose ps --format json' output
+    
+    Depending on the Compose version this is either one JSON array or one
+    object per line. Compose v1 has no JSON output, which is only detected
+    here rather than by probing the version before every ps.
+    
+    Args:
+        output: Command output
+        
+    Returns:
+        List of container dicts
+        
+    Raises:
+        RuntimeError: If the output is not JSON
+    """
+    output = output.strip()
+    try:
+        if output.startswith("["):
+            return json.loads(output)
+        return [json.loads(line) for line in output.splitlines() if line.strip()]
+    except json.JSONDecodeError:
+        raise RuntimeError(_JSON_PS_REQUIRED) from None
 
 class DockerCompose:
     """Wrapper for Docker Compose operations"""
 
-    def __init__(self, compose_file=None, env_file=None):
+    # Default for echoing each command before it runs; the CLI turns this on
+    # for --verbose
+    verbose = False
+
+    def __init__(self, compose_file=None, env_file=None, verbose=None):
         """Initialize the Docker Compose wrapper"""
+        if verbose is not None:
+            self.verbose = verbose
+        
         self.project_root = get_project_root()
         self.compose_dir = self.project_root / "src" / "compose"
         
@@ -26,6 +76,19 @@ class DockerCompose:
             self.env_file = Path(env_file)
         else:
             self.env_file = self.project_root / ".env"
+        
+        # Leading arguments shared by every command; whether the env file
+        # exists is checked once, when the wrapper is created
+        self._base_args = (_DOCKER_BIN, "compose", "-f", str(self.compose_file))
+        if self.env_file.exists():
+            self._base_args += ("--env-file", str(self.env_file))
+        
+        # Docker version cache shared with 'spark status'
+        self._versions_cache = self.project_root / ".sparkbaas" / "docker_versions.json"
+        
+        # Cached running service -> container ID map, cleared whenever
+        # services change
+        self._running_services = None
 
     def _build_command(self, *args, env_vars=None):
         """
@@ -36,29 +99,13 @@ class DockerCompose:
             env_vars: Additional environment variables as dict
             
         Returns:
-            List of command parts
+            Tuple of (command parts, environment for the subprocess); the
+            environment is None, i.e. inherited, unless env_vars is given
         """
-        # Set up environment variables
-        cmd_env = os.environ.copy()
-        
-        # Add custom environment variables
-        if env_vars:
-            cmd_env.update(env_vars)
-        
-        # Build the base command
-        cmd = ["docker", "compose"]
+        # Only copy the environment when variables need adding
+        cmd_env = {**os.environ, **env_vars} if env_vars else None
         
-        # Add file reference
-        cmd.extend(["-f", str(self.compose_file)])
-        
-        # Add environment file if it exists
-        if self.env_file.exists():
-            cmd.extend(["--env-file", str(self.env_file)])
-            
-        # Add the specific command and arguments
-        cmd.extend(args)
-        
-        return cmd, cmd_env
+        return [*self._base_args, *args], cmd_env
 
     def run(self, *args, env_vars=None, capture_output=False, check=True):
         """
@@ -75,15 +122,19 @@ class DockerCompose:
         """
         cmd, cmd_env = self._build_command(*args, env_vars=env_vars)
         
-        print_info(f"Running: {' '.join(cmd)}")
+        if self.verbose:
+            print_info(f"Running: {' '.join(cmd)}")
         
+        # Commands never read from the terminal; a closed stdin also keeps
+        # them from blocking when run from cron or CI
         try:
             if capture_output:
                 result = subprocess.run(
                     cmd,
                     env=cmd_env,
+                    stdin=subprocess.DEVNULL,
                     capture_output=True,
-                    text=True,
+                    encoding="utf-8", errors="replace",
                     check=check
                 )
                 return result
@@ -91,6 +142,7 @@ class DockerCompose:
                 result = subprocess.run(
                     cmd, 
                     env=cmd_env,
+                    stdin=subprocess.DEVNULL,
                     check=check
                 )
                 return result
@@ -103,7 +155,8 @@ class DockerCompose:
             print_error(f"Failed to run Docker Compose command: {str(e)}")
             raise
 
-    def up(self, detached=True, services=None, build=False):
+    def up(self, detached=True, services=None, build=False, pull=None,
+           no_deps=False, force_recreate=False):
         """
         Start services defined in docker-compose.yml
         
@@ -111,12 +164,27 @@ class DockerCompose:
             detached: Run in detached mode
             services: List of specific services to start
             build: Whether to build images before starting
+            pull: Image pull policy ("always", "missing" or "never"); with
+                "always", changed images are pulled and their containers
+                recreated in the same call
+            no_deps: Don't start linked services
+            force_recreate: Recreate containers even if nothing changed
         """
+        self._running_services = None
+        if detached and not (services or build or pull or no_deps or force_recreate):
+            return self.run(*_UP_DETACHED)
+        
         args = ["up"]
         if detached:
             args.append("-d")
         if build:
             args.append("--build")
+        if pull:
+            args.extend(["--pull", pull])
+        if no_deps:
+            args.append("--no-deps")
+        if force_recreate:
+            args.append("--force-recreate")
             
         if services:
             args.extend(services)
@@ -131,6 +199,10 @@ class DockerCompose:
             volumes: Whether to remove volumes
             remove_orphans: Whether to remove containers for services not defined in compose file
         """
+        self._running_services = None
+        if remove_orphans and not volumes:
+            return self.run(*_DOWN_DEFAULT)
+        
         args = ["down"]
         if volumes:
             args.append("-v")
@@ -150,26 +222,200 @@ class DockerCompose:
         if services:
             args.extend(services)
             
+        self._running_services = None
+        return self.run(*args)
+
+    def restart(self, services=None):
+        """
+        Restart services defined in docker-compose.yml
+        
+        Args:
+            services: List of specific services to restart
+        """
+        args = ["restart"]
+        if services:
+            args.extend(services)
+            
+        self._running_services = None
         return self.run(*args)
 
-    def ps(self, services=None):
+    def start_existing(self, service):
+        """
+        Start a service's existing container without going through compose
+        
+        Looks the container up by the labels compose puts on it and, if it is
+        stopped, starts it with 'docker start'. This skips compose's project
+        load and dependency resolution, but also its check for configuration
+        changes, so use up() when the container may need recreating.
+        
+        Args:
+            service: Service name
+            
+        Returns:
+            True if the service's container is now running, False if there is
+            no single existing container to start (callers should use up())
+        """
+        result = subprocess.run(
+            [
+                _DOCKER_BIN, "ps", "-a",
+                "--filter", f"label=com.docker.compose.project.config_files={self.compose_file.resolve()}",
+                "--filter", f"label=com.docker.compose.service={service}",
+                "--format", "{{.ID}} {{.State}}"
+            ],
+            capture_output=True, encoding="utf-8", errors="replace", check=False
+        )
+        containers = result.stdout.split("\n")
+        containers = [c.split() for c in containers if c.strip()]
+        if result.returncode != 0 or len(containers) != 1:
+            return False
+        
+        container_id, state = containers[0]
+        if state != "running":
+            if self.verbose:
+                print_info(f"Running: docker start {container_id}")
+            if subprocess.run([_DOCKER_BIN, "start", container_id], check=False).returncode != 0:
+                return False
+            self._running_services = None
+        return True
+
+    def compose_version(self):
+        """
+        Get the Docker Compose version
+        
+        Probed with 'docker compose version --short' once per process and
+        cached with the Docker version in the state directory (see
+        get_docker_versions()).
+        
+        Returns:
+            Version as a tuple of ints, e.g. (2, 29, 1), or None if unknown
+        """
+        match = _VERSION_RE.search(get_docker_versions(self._versions_cache)[1] or "")
+        return tuple(int(part) for part in match.group().split(".")) if match else None
+
+    def ps(self, services=None, stream=False):
         """
         List containers for services defined in docker-compose.yml
         
         Args:
             services: List of specific services to show
+            stream: Return a generator that yields each container as docker
+                prints it instead of a list
             
         Returns:
-            List of running services
+            List of container dicts as reported by 'docker compose ps
+            --format json' (Name, Service, State, Health, Publishers, ...)
         """
-        args = ["ps"]
+        args = ["ps", "--format", "json"]
         if services:
             args.extend(services)
-            
+        
+        if stream:
+            return self._stream_json(*args)
         result = self.run(*args, capture_output=True)
-        return result.stdout
+        return _parse_ps_json(result.stdout)
 
-    def logs(self, services=None, follow=False, tail=None):
+    def _stream_json(self, *args):
+        """
+        Run a Docker Compose command and yield its JSON output object by object
+        
+        Newline-delimited output is decoded a line at a time as it arrives;
+        older Compose versions that print a single JSON array are decoded
+        in one go. The process is terminated if the caller stops iterating
+        early.
+        
+        Args:
+            *args: Command and arguments to pass to docker-compose
+            
+        Yields:
+            Decoded JSON objects
+            
+        Raises:
+            subprocess.CalledProcessError: If the command fails
+            RuntimeError: If the output is not JSON (see _parse_ps_json())
+        """
+        cmd, cmd_env = self._build_command(*args)
+        
+        if self.verbose:
+            print_info(f"Running: {' '.join(cmd)}")
+        
+        with subprocess.Popen(
+            cmd,
+            env=cmd_env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            encoding="utf-8", errors="replace"
+        ) as proc:
+            try:
+                for line in proc.stdout:
+                    if line.startswith("["):
+                        line += proc.stdout.read()
+                    yield from _parse_ps_json(line)
+            finally:
+                if proc.poll() is None:
+                    proc.terminate()
+        
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+    def _running_containers(self):
+        """
+        Map running services to their container IDs
+        
+        Parsed from 'docker compose ps --format json'. The result is cached
+        on the instance; up(), down(), stop() and restart() clear the cache.
+        
+        Returns:
+            Dict of service name -> container ID
+        """
+        if self._running_services is None:
+            result = self.run(
+                "ps", "--format", "json", "--filter", "status=running",
+                capture_output=True
+            )
+            containers = _parse_ps_json(result.stdout)
+            self._running_services = {c["Service"]: c["ID"] for c in containers}
+        return self._running_services
+
+    def running_services(self):
+        """
+        Get the names of services with running containers
+        
+        Repeated checks share a single 'docker compose ps' call (see
+        _running_containers()).
+        
+        Returns:
+            Set-like view of running service names
+        """
+        return self._running_containers().keys()
+
+    def container_id(self, service):
+        """
+        Get the ID of a service's running container
+        
+        Args:
+            service: Service name
+            
+        Returns:
+            Container ID, or None if the service isn't running
+        """
+        return self._running_containers().get(service)
+
+    def service_running(self, name):
+        """
+        Check whether a service has a running container
+        
+        Matches exact service names, so e.g. 'postgres' is not confused with
+        'postgres-exporter'.
+        
+        Args:
+            name: Service name
+            
+        Returns:
+            True if the service is running, False otherwise
+        """
+        return name in self.running_services()
+
+    def logs(self, services=None, follow=False, tail=None, stream=False):
         """
         View logs for services defined in docker-compose.yml
         
@@ -177,6 +423,8 @@ class DockerCompose:
             services: List of specific services to show logs for
             follow: Whether to follow log output
             tail: Number of lines to show from end of logs
+            stream: Return a generator of log lines instead of letting the
+                output go straight to the terminal
         """
         args = ["logs"]
         if follow:
@@ -185,9 +433,45 @@ class DockerCompose:
             args.extend(["--tail", str(tail)])
         if services:
             args.extend(services)
-            
+        
+        if stream:
+            return self._stream_lines(*args)
         return self.run(*args)
 
+    def _stream_lines(self, *args):
+        """
+        Run a Docker Compose command and yield its output line by line
+        
+        Lines are yielded as soon as docker writes them, so nothing is
+        buffered beyond the current line. The process is terminated if the
+        caller stops iterating early.
+        
+        Args:
+            *args: Command and arguments to pass to docker-compose
+            
+        Yields:
+            Output lines (stdout and stderr combined), including newlines
+        """
+        cmd, cmd_env = self._build_command(*args)
+        
+        if self.verbose:
+            print_info(f"Running: {' '.join(cmd)}")
+        
+        with subprocess.Popen(
+            cmd,
+            env=cmd_env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            encoding="utf-8", errors="replace",
+            bufsize=1
+        ) as proc:
+            try:
+                yield from proc.stdout
+            finally:
+                if proc.poll() is None:
+                    proc.terminate()
+
     def run_service(self, service, command, entrypoint=None, env_vars=None):
         """
         Run a command in a one-off service container
@@ -211,6 +495,62 @@ class DockerCompose:
             
         return self.run(*args, env_vars=env_vars)
 
+    def exec_stream(self, service, command, stdin=subprocess.DEVNULL, stdout=None):
+        """
+        Start a command in a running service container without waiting for it
+        
+        The command runs via 'docker compose exec -T' so its stdin/stdout can
+        be piped, e.g. to stream a database dump straight to the host.
+        
+        Args:
+            service: Service whose container should run the command
+            command: Command and arguments as a list
+            stdin: stdin for the process (e.g. subprocess.PIPE); closed by
+                default
+            stdout: stdout for the process (e.g. subprocess.PIPE)
+            
+        Returns:
+            Popen object for the running command
+        """
+        cmd, cmd_env = self._build_command("exec", "-T", service, *command)
+        
+        if self.verbose:
+            print_info(f"Running: {' '.join(cmd)}")
+        
+        return subprocess.Popen(cmd, env=cmd_env, stdin=stdin, stdout=stdout)
+
+    def wait_for_service(self, service, command, timeout=30):
+        """
+        Poll a readiness command in a service container until it succeeds
+        
+        Polls with exponential backoff (0.25s doubling, capped at 1s), so an
+        already-ready service returns after a single probe.
+        
+        Args:
+            service: Service whose container should run the probe
+            command: Probe command and arguments as a list (e.g. pg_isready)
+            timeout: Maximum number of seconds to wait
+            
+        Returns:
+            True if the probe succeeded within the timeout, False otherwise
+        """
+        cmd, cmd_env = self._build_command("exec", "-T", service, *command)
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        
+        while True:
+            result = subprocess.run(
+                cmd, env=cmd_env, stdin=subprocess.DEVNULL, capture_output=True
+            )
+            if result.returncode == 0:
+                return True
+            
+            delay = min(0.25 * 2 ** attempt, 1)
+            if time.monotonic() + delay > deadline:
+                return False
+            time.sleep(delay)
+            attempt += 1
+
     def setup_compose(self, compose_file="docker-compose.setup.yml"):
         """
         Get a DockerCompose instance for setup operations
@@ -222,4 +562,17 @@ class DockerCompose:
             DockerCompose instance configured for setup
         """
         setup_file = self.compose_dir / compose_file
-        return DockerCompose(compose_file=setup_file, env_file=self.env_file)
\ No newline at end of file
+        return DockerCompose(compose_file=setup_file, env_file=self.env_file, verbose=self.verbose)
+
+@functools.lru_cache(maxsize=1)
+def get_compose():
+    """
+    Get the process-wide DockerCompose wrapper for the main compose file
+    
+    Created on first use, so a command's helpers share one wrapper (and its
+    cached ps snapshot) instead of each locating the project again.
+    
+    Returns:
+        DockerCompose instance
+    """
+    return DockerCompose()
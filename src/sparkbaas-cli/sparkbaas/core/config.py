@@ -1,9 +1,74 @@
 import os
+import functools
 from pathlib import Path
 import re
-from dotenv import load_dotenv
 
-from sparkbaas.core.utils import get_project_root, load_yaml, save_yaml
+from sparkbaas.core.utils import (
+    get_project_root, load_yaml, save_yaml, load_json, save_json, atomic_write_bytes
+)
+
+# Image tag, e.g. "15-alpine" in "postgres:15-alpine"
+_IMAGE_TAG_RE = re.compile(r':([^:]+)$')
+
+# Trailing comment after an unquoted .env value
+_ENV_COMMENT_RE = re.compile(r'\s+#.*')
+
+# ${NAME} or ${NAME:-default} reference in a .env value
+_ENV_VAR_REF_RE = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)(?::-([^}]*))?\}')
+
+def read_env_file(env_file):
+    """
+    Parse a .env file of KEY=value lines
+    
+    Blank lines and comments are skipped, an 'export ' prefix is allowed and
+    matching quotes around a value are removed. ${NAME} and ${NAME:-default}
+    in unquoted and double-quoted values are resolved against the variables
+    above them, then the process environment. Multi-line values are not
+    supported; set SPARKBAAS_USE_DOTENV=1 to parse with python-dotenv instead
+    (installed separately, it is not a requirement of the CLI).
+    
+    Args:
+        env_file: Path to the .env file
+        
+    Returns:
+        Dict of variable names and values
+    """
+    if os.environ.get("SPARKBAAS_USE_DOTENV"):
+        try:
+            from dotenv import dotenv_values
+        except ImportError:
+            print("SPARKBAAS_USE_DOTENV is set but python-dotenv is not installed "
+                  "(pip install python-dotenv); using the built-in .env parser.")
+        else:
+            return dict(dotenv_values(env_file))
+    
+    def resolve(match):
+        name, default = match.groups()
+        value = env_vars.get(name, os.environ.get(name))
+        if not value and default is not None:
+            return default
+        return value or ""
+    
+    env_vars = {}
+    with open(env_file) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('export '):
+                line = line[7:]
+            name, sep, value = line.partition('=')
+            if not sep:
+                continue
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+                quote, value = value[0], value[1:-1]
+            else:
+                quote, value = None, _ENV_COMMENT_RE.sub('', value)
+            if quote != "'" and "${" in value:
+                value = _ENV_VAR_REF_RE.sub(resolve, value)
+            env_vars[name.strip()] = value
+    return env_vars
 
 class Config:
     """Configuration management for SparkBaaS"""
@@ -15,21 +80,39 @@ class Config:
         self.env_file = self.project_root / ".env"
         self.config_dir = self.compose_dir / "config"
         
-        # Create state directory if it doesn't exist
-        self.state_dir = self.project_root / ".sparkbaas"
-        self.state_dir.mkdir(exist_ok=True)
-        
         # State file to track SparkBaaS version and components
+        self.state_dir = self.project_root / ".sparkbaas"
         self.state_file = self.state_dir / "state.yml"
         
-        # Load environment variables
+        # Create state directory if it doesn't exist; an existing state file
+        # implies the directory does, which saves the mkdir on most runs
+        if not self.state_file.exists():
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Cached result of is_initialized(), reset whenever the state is saved
+        self._initialized = None
+        
+        # Lines of the .env file as last read or written by set_env_vars()
+        self._env_lines = None
+        
+        # Last state read or saved, and the state file's mtime at the time
+        self._state_cache = None
+        self._state_mtime = None
+        
+        # Load environment variables; ones already set in the process
+        # environment take precedence
         if self.env_file.exists():
-            load_dotenv(self.env_file)
+            for name, value in read_env_file(self.env_file).items():
+                os.environ.setdefault(name, value)
     
     def get_component_versions(self):
         """
         Get the versions of SparkBaaS components from docker-compose
         
+        The result is saved to a JSON file in the state directory and reused
+        until docker-compose.yml changes, so the YAML is only parsed after
+        an edit.
+        
         Returns:
             Dict of component names and versions
         """
@@ -37,8 +120,19 @@ class Config:
         
         # Parse docker-compose.yml to get service versions
         compose_file = self.compose_dir / "docker-compose.yml"
-        if not compose_file.exists():
+        try:
+            st = compose_file.stat()
+        except FileNotFoundError:
             return versions
+        
+        source = [st.st_mtime_ns, st.st_size]
+        cache_file = self.state_dir / "compose_versions.json"
+        try:
+            cached = load_json(cache_file)
+            if cached["source"] == source:
+                return cached["versions"]
+        except Exception:
+            pass
             
         try:
             compose_data = load_yaml(compose_file)
@@ -48,7 +142,7 @@ class Config:
                 if 'image' in service_config:
                     image = service_config['image']
                     # Extract version from image tag (e.g., postgres:15-alpine)
-                    match = re.search(r':([^:]+)$', image)
+                    match = _IMAGE_TAG_RE.search(image)
                     if match:
                         version = match.group(1)
                     else:
@@ -57,6 +151,12 @@ class Config:
                     versions[service_name] = version
         except Exception as e:
             print(f"Error parsing docker-compose.yml: {str(e)}")
+            return versions
+        
+        try:
+            save_json({"source": source, "versions": versions}, cache_file)
+        except OSError:
+            pass
         
         return versions
     
@@ -73,6 +173,49 @@ class Config:
         """
         return os.environ.get(name, default)
     
+    def get_env_vars(self):
+        """
+        Get all environment variables in one read
+        
+        The .env file is parsed fresh, so values written since this Config
+        was created are included. Variables already set in the process
+        environment take precedence.
+        
+        Returns:
+            Dict of variable names and values
+        """
+        env_vars = read_env_file(self.env_file) if self.env_file.exists() else {}
+        env_vars.update(os.environ)
+        return env_vars
+    
+    def _load_env_lines(self):
+        """
+        Read the .env file as lines, indexed by variable name
+        
+        The lines are kept until the file's modification time or size
+        changes.
+        
+        Returns:
+            Tuple of (lines, dict of name -> indexes of the lines setting it,
+            whether the file exists)
+        """
+        try:
+            st = self.env_file.stat()
+            stamp = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            stamp = None
+        
+        if self._env_lines is None or self._env_lines[0] != stamp:
+            lines = self.env_file.read_text().split("\n") if stamp else [""]
+            index = {}
+            for i, line in enumerate(lines):
+                name, sep, _ = line.partition("=")
+                if sep:
+                    index.setdefault(name, []).append(i)
+            self._env_lines = (stamp, lines, index)
+        
+        return self._env_lines[1], self._env_lines[2], stamp is not None
+    
     def set_env_var(self, name, value):
         """
         Set an environment variable in the .env file
@@ -81,44 +224,74 @@ class Config:
             name: Name of the environment variable
             value: Value to set
         """
-        # Read existing .env file
-        env_content = ""
-        if self.env_file.exists():
-            with open(self.env_file, 'r') as f:
-                env_content = f.read()
-        
-        # Check if variable already exists
-        pattern = re.compile(f"^{re.escape(name)}=.*$", re.MULTILINE)
-        if pattern.search(env_content):
-            # Replace existing variable
-            env_content = pattern.sub(f"{name}={value}", env_content)
-        else:
-            # Add new variable
-            env_content += f"\n{name}={value}"
+        self.set_env_vars({name: value})
+    
+    def set_env_vars(self, env_vars):
+        """
+        Set several environment variables in the .env file at once
         
-        # Write updated content
-        with open(self.env_file, 'w') as f:
-            f.write(env_content)
+        New variables are appended to the file; it is only rewritten when an
+        existing variable changes value.
+        
+        Args:
+            env_vars: Dict of variable names and values
+        """
+        lines, index, exists = self._load_env_lines()
+        
+        rewrite = False
+        appended = []
+        for name, value in env_vars.items():
+            line = f"{name}={value}"
+            if name in index:
+                for i in index[name]:
+                    if lines[i] != line:
+                        lines[i] = line
+                        rewrite = True
+            else:
+                index[name] = [len(lines)]
+                lines.append(line)
+                appended.append(line)
+        
+        if rewrite or (appended and not exists):
+            atomic_write_bytes(self.env_file, "\n".join(lines).encode())
+        elif appended:
+            with open(self.env_file, 'a') as f:
+                f.write("".join(f"\n{line}" for line in appended))
+        
+        if rewrite or appended:
+            st = self.env_file.stat()
+            self._env_lines = ((st.st_mtime_ns, st.st_size), lines, index)
         
         # Update current environment
-        os.environ[name] = value
+        os.environ.update(env_vars)
     
     def get_state(self):
         """
         Get the current state of SparkBaaS
         
+        The parsed state is kept until the state file's modification time
+        changes. The same dict is returned each time, so callers that modify
+        it should save it with save_state().
+        
         Returns:
             Dict containing state information
         """
-        if not self.state_file.exists():
+        try:
+            mtime = self.state_file.stat().st_mtime_ns
+        except FileNotFoundError:
             return {
                 'version': '0.0.0',
                 'initialized': False,
                 'components': {}
             }
+        
+        if self._state_cache is not None and self._state_mtime == mtime:
+            return self._state_cache
             
         try:
-            return load_yaml(self.state_file)
+            self._state_cache = load_yaml(self.state_file)
+            self._state_mtime = mtime
+            return self._state_cache
         except Exception:
             return {
                 'version': '0.0.0',
@@ -134,16 +307,23 @@ class Config:
             state: Dict containing state information
         """
         save_yaml(state, self.state_file)
+        self._state_cache = state
+        self._state_mtime = self.state_file.stat().st_mtime_ns
+        self._initialized = None
     
     def is_initialized(self):
         """
         Check if SparkBaaS has been initialized
         
+        The state file is only read on the first call; save_state() resets
+        the cached answer.
+        
         Returns:
             True if initialized, False otherwise
         """
-        state = self.get_state()
-        return state.get('initialized', False)
+        if self._initialized is None:
+            self._initialized = self.get_state().get('initialized', False)
+        return self._initialized
     
     def mark_as_initialized(self):
         """Mark SparkBaaS as initialized"""
@@ -176,4 +356,17 @@ class Config:
         Returns:
             Path to migrations directory
         """
-        return self.project_root / "src" / "migrations"
\ No newline at end of file
+        return self.project_root / "src" / "migrations"
+
+@functools.lru_cache(maxsize=None)
+def get_config():
+    """
+    Get the process-wide Config instance
+    
+    Created on first use, so later callers share its cached state instead
+    of repeating the setup and state file reads.
+    
+    Returns:
+        Config instance
+    """
+    return Config()
\ No newline at end of file
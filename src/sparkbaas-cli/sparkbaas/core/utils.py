@@ -1,40 +1,67 @@
 import os
 import sys
-import platform
-import shutil
-import tempfile
+import functools
+import subprocess
+import threading
+import time
 from pathlib import Path
-import yaml
-import json
 
+# yaml, json, shutil, tempfile and platform are imported where they are
+# used, so importing this module stays cheap
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+@functools.lru_cache(maxsize=1)
+def _yaml():
+    """
+    Import PyYAML and pick its loader and dumper
+    
+    libyaml's C implementations are preferred when PyYAML was built with
+    them.
+    
+    Returns:
+        Tuple of (yaml module, safe loader class, safe dumper class)
+    """
+    import yaml
+    
+    try:
+        return yaml, yaml.CSafeLoader, yaml.CSafeDumper
+    except AttributeError:
+        return yaml, yaml.SafeLoader, yaml.SafeDumper
+
+@functools.lru_cache(maxsize=1)
 def get_project_root():
     """
     Find the project root directory
     
+    SPARKBAAS_ROOT, if set, is used as is; otherwise the root is searched for
+    from the current directory upwards. The result is cached for the
+    lifetime of the process.
+    
     Returns:
         Path to the project root directory
     """
-    # Start with the current directory
-    current_dir = Path.cwd()
+    root = os.environ.get("SPARKBAAS_ROOT")
+    if root:
+        return Path(root)
     
-    # Try to find the src directory
-    while current_dir != current_dir.parent:
-        # Check if this is the root directory (contains src/compose)
-        if (current_dir / "src" / "compose").exists():
-            return current_dir
-            
-        # Check if we're in the sparkbaas-cli directory
-        if (current_dir.name == "sparkbaas-cli" and 
-            current_dir.parent.name == "src" and 
-            (current_dir.parent.parent / "src" / "compose").exists()):
-            return current_dir.parent.parent
-            
-        # Check if this is inside the src directory
-        if current_dir.name == "src" and (current_dir / "compose").exists():
-            return current_dir.parent
-            
+    # Walk up from the current directory to the first one containing
+    # src/compose. One isdir() per level: starting inside src/ or
+    # src/sparkbaas-cli/ simply finds the root a level or two further up.
+    current_dir = os.getcwd()
+    while True:
+        if os.path.isdir(os.path.join(current_dir, "src", "compose")):
+            return Path(current_dir)
+        
         # Move up to parent directory
-        current_dir = current_dir.parent
+        parent = os.path.dirname(current_dir)
+        if parent == current_dir:
+            break
+        current_dir = parent
     
     # If we get here, we couldn't find the project root
     # Force a fallback to the expected structure
@@ -73,27 +100,90 @@ def copy_template(src, dest, replacements=None):
     with open(src, 'r') as f:
         content = f.read()
     
-    # Replace placeholders
+    # Replace all placeholders ("{{{ key }}}") in a single pass
     if replacements:
-        for key, value in replacements.items():
-            content = content.replace(f"{{{{{{ {key} }}}}}}", str(value))
+        import re
+        
+        pattern = re.compile(
+            r"\{\{\{ (" + "|".join(re.escape(key) for key in replacements) + r") \}\}\}"
+        )
+        content = pattern.sub(lambda match: str(replacements[match.group(1)]), content)
     
     # Write the output
     with open(dest, 'w') as f:
         f.write(content)
 
+def atomic_write_bytes(file_path, content):
+    """
+    Replace a file's contents atomically
+    
+    The data is written to a temporary file in the same directory, flushed to
+    disk with a single fsync, and then renamed over the target, so readers (or
+    a crash mid-write) only ever see the old or the new contents, never a
+    truncated file.
+    
+    Args:
+        file_path: Path to the file to write
+        content: Bytes to write
+    """
+    file_path = Path(file_path)
+    
+    # Keep the permissions of the file being replaced (mkstemp uses 0600)
+    try:
+        mode = file_path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    
+    import tempfile
+    
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+# Parsed YAML files: absolute path -> (st_mtime_ns, st_size, content)
+_yaml_cache = {}
+
 def load_yaml(file_path):
     """
     Load a YAML file
     
+    Files are only parsed again when their modification time or size
+    changes. Each call returns its own copy, so callers may modify it.
+    
     Args:
         file_path: Path to YAML file
         
     Returns:
         Parsed YAML content
     """
-    with open(file_path, 'r') as f:
-        return yaml.safe_load(f)
+    import copy
+    
+    key = os.path.abspath(file_path)
+    st = os.stat(key)
+    cached = _yaml_cache.get(key)
+    if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+        yaml, loader, _ = _yaml()
+        # Hand the raw bytes to the loader; libyaml decodes them in C
+        with open(key, 'rb') as f:
+            cached = _yaml_cache[key] = (st.st_mtime_ns, st.st_size, yaml.load(f.read(), Loader=loader))
+    return copy.deepcopy(cached[2])
+
+def invalidate_yaml_cache(file_path):
+    """
+    Drop a file from load_yaml()'s cache
+    
+    Args:
+        file_path: Path to YAML file
+    """
+    _yaml_cache.pop(os.path.abspath(file_path), None)
 
 def save_yaml(data, file_path):
     """
@@ -103,8 +193,11 @@ def save_yaml(data, file_path):
         data: Data to save
         file_path: Path to save YAML file
     """
-    with open(file_path, 'w') as f:
-        yaml.dump(data, f, default_flow_style=False)
+    yaml, _, dumper = _yaml()
+    content = yaml.dump(data, Dumper=dumper, default_flow_style=False, encoding="utf-8")
+    with open(file_path, 'wb') as f:
+        f.write(content)
+    invalidate_yaml_cache(file_path)
 
 def load_json(file_path):
     """
@@ -116,6 +209,11 @@ def load_json(file_path):
     Returns:
         Parsed JSON content
     """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(Path(file_path).read_bytes())
+    
+    import json
+    
     with open(file_path, 'r') as f:
         return json.load(f)
 
@@ -127,44 +225,199 @@ def save_json(data, file_path):
         data: Data to save
         file_path: Path to save JSON file
     """
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    if ORJSON_AVAILABLE:
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        import json
+        content = json.dumps(data, indent=2).encode()
+    
+    atomic_write_bytes(file_path, content)
 
+@functools.lru_cache(maxsize=None)
 def is_docker_available():
     """
-    Check if Docker is installed and available
+    Check if Docker is installed
+    
+    Only looks the docker CLI up on PATH; use is_docker_daemon_running()
+    before operations that need the daemon. The result is cached for the
+    lifetime of the process.
     
     Returns:
         True if Docker is available, False otherwise
     """
-    docker_cmd = "docker --version"
-    try:
-        result = os.system(f"{docker_cmd} > {os.devnull} 2>&1")
-        return result == 0
-    except:
-        return False
+    import shutil
+    
+    return shutil.which("docker") is not None
 
+@functools.lru_cache(maxsize=None)
 def is_docker_compose_available():
     """
-    Check if Docker Compose is installed and available
+    Check if Docker Compose is installed
+    
+    Accepts the standalone docker-compose binary, or the docker CLI with the
+    compose plugin installed in one of the usual plugin directories. Only
+    when neither is found but docker is, 'docker compose version' is run to
+    check for a plugin installed elsewhere. The result is cached for the
+    lifetime of the process.
     
     Returns:
         True if Docker Compose is available, False otherwise
     """
-    # Modern Docker CLI with compose command
-    modern_cmd = "docker compose version"
-    legacy_cmd = "docker-compose --version"
+    import shutil
+    
+    if shutil.which("docker-compose") is not None:
+        return True
+    
+    docker = shutil.which("docker")
+    if docker is None:
+        return False
+    
+    if _compose_plugin_path() is not None:
+        return True
     
+    return _version_output([docker, "compose", "version"]) is not None
+
+def _compose_plugin_path():
+    """Find the docker compose CLI plugin in the usual plugin directories"""
+    docker_config = os.environ.get("DOCKER_CONFIG") or os.path.expanduser("~/.docker")
+    for plugin_dir in (
+        os.path.join(docker_config, "cli-plugins"),
+        "/usr/local/lib/docker/cli-plugins",
+        "/usr/local/libexec/docker/cli-plugins",
+        "/usr/lib/docker/cli-plugins",
+        "/usr/libexec/docker/cli-plugins",
+    ):
+        plugin = os.path.join(plugin_dir, "docker-compose")
+        if os.access(plugin, os.X_OK):
+            return plugin
+    return None
+
+@functools.lru_cache(maxsize=None)
+def is_docker_daemon_running():
+    """
+    Check if the Docker daemon is reachable
+    
+    Spawns the docker CLI, so call this right before operations that need
+    the daemon rather than on every command. The result is cached for the
+    lifetime of the process.
+    
+    Returns:
+        True if the daemon answered, False otherwise
+    """
+    import shutil
+    
+    docker = shutil.which("docker")
+    if docker is None:
+        return False
+    
+    # Ask the daemon for its version: one quick round-trip that proves the
+    # daemon is reachable without listing containers like 'docker ps'
     try:
-        result = os.system(f"{modern_cmd} > {os.devnull} 2>&1")
-        if result == 0:
-            return True
-            
-        result = os.system(f"{legacy_cmd} > {os.devnull} 2>&1")
-        return result == 0
-    except:
+        result = subprocess.run(
+            [docker, "version", "--format", "{{.Server.Version}}"],
+            capture_output=True, timeout=3, check=False
+        )
+        return result.returncode == 0
+    except (subprocess.TimeoutExpired, OSError):
+        # A hung or unreachable daemon counts as unavailable
         return False
 
+def _version_output(command):
+    """Run a version command, returning its output or None if it fails"""
+    try:
+        result = subprocess.run(command, capture_output=True, encoding="utf-8", errors="replace", timeout=10, check=False)
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+# Serializes version detection so concurrent callers share one probe
+_docker_versions_lock = threading.Lock()
+
+# Versions detected in this process, whichever cache file was asked for
+_docker_versions = None
+
+def get_docker_versions(cache_file=None):
+    """
+    Get the Docker and Docker Compose version strings
+    
+    The versions are detected once per process, even when requested from
+    several threads at once or with different cache files. If a cache file
+    is given, they are also saved there along with the paths and
+    modification times of the docker CLI and its compose plugin, so later
+    runs skip the version commands until either is reinstalled or upgraded.
+    
+    Args:
+        cache_file: Optional JSON file to persist the versions in
+        
+    Returns:
+        Tuple of ('docker --version' output, 'docker compose version --short'
+        output); either is None if it could not be determined
+    """
+    global _docker_versions
+    
+    with _docker_versions_lock:
+        if _docker_versions is None:
+            _docker_versions = _detect_docker_versions(cache_file)
+        return _docker_versions
+
+def _detect_docker_versions(cache_file):
+    """Detect the versions for get_docker_versions(); not thread-safe"""
+    import shutil
+    
+    docker = shutil.which("docker")
+    if docker is None:
+        return None, None
+    
+    # The compose plugin is upgraded separately from the docker CLI, so both
+    # binaries key the cache; without a known plugin path nothing is saved
+    plugin = _compose_plugin_path()
+    if plugin is None:
+        cache_file = None
+    else:
+        stamp = [docker, os.stat(docker).st_mtime_ns, plugin, os.stat(plugin).st_mtime_ns]
+    
+    if cache_file is not None:
+        try:
+            cached = load_json(cache_file)
+            if cached["binary"] == stamp:
+                return cached["docker"], cached["docker_compose"]
+        except Exception:
+            pass
+    
+    versions = (
+        _version_output([docker, "--version"]),
+        _version_output([docker, "compose", "version", "--short"])
+    )
+    
+    if cache_file is not None and all(versions):
+        try:
+            save_json({"binary": stamp, "docker": versions[0], "docker_compose": versions[1]}, cache_file)
+        except OSError:
+            pass
+    
+    return versions
+
+@functools.lru_cache(maxsize=None)
+def _run_localtime():
+    """Local time of the first timestamp request in this process"""
+    return time.localtime()
+
+def run_timestamp(fmt):
+    """
+    Format the time the current command started
+    
+    The local time is read once per process, so every file a command names
+    or stamps (backups, generated headers, migration files) carries the
+    same time.
+    
+    Args:
+        fmt: time.strftime format string
+        
+    Returns:
+        Formatted timestamp
+    """
+    return time.strftime(fmt, _run_localtime())
+
 def get_os_type():
     """
     Get the current operating system type
@@ -172,6 +425,8 @@ def get_os_type():
     Returns:
         String indicating the OS type: "Windows", "Linux", "macOS", or "Unknown"
     """
+    import platform
+    
     system = platform.system()
     if system == "Windows":
         return "Windows"
@@ -182,33 +437,32 @@ def get_os_type():
     else:
         return "Unknown"
 
+@functools.lru_cache(maxsize=1)
 def get_available_memory_gb():
     """
     Get available system memory in GB
     
+    Read once per process. On Linux /proc/meminfo is tried first, so psutil
+    is only imported on other systems or if that fails.
+    
     Returns:
         Available memory in GB (float) or None if could not be determined
     """
+    if get_os_type() == "Linux":
+        try:
+            with open('/proc/meminfo', 'r') as f:
+                for line in f:
+                    if line.startswith('MemAvailable:'):
+                        # Extract the value (in kB)
+                        return int(line.split()[1]) / (1024 * 1024)
+        except (OSError, ValueError, IndexError):
+            pass
+    
     try:
         import psutil
         return psutil.virtual_memory().available / (1024 * 1024 * 1024)
     except:
-        # Fallback for when psutil is not available
-        os_type = get_os_type()
-        if os_type == "Linux":
-            # Try to get memory from /proc/meminfo
-            try:
-                with open('/proc/meminfo', 'r') as f:
-                    for line in f:
-                        if 'MemAvailable' in line:
-                            # Extract the value (in kB)
-                            kb = int(line.split()[1])
-                            return kb / (1024 * 1024)
-                return None
-            except:
-                return None
-        else:
-            return None
+        return None
 
 def get_cpu_cores():
     """
@@ -1,19 +1,36 @@
-from rich.console import Console
-from rich.panel import Panel
-from rich.style import Style
-from rich.text import Text
+import functools
 
-try:
-    import pyfiglet
-    PYFIGLET_AVAILABLE = True
-except ImportError:
-    PYFIGLET_AVAILABLE = False
+@functools.lru_cache(maxsize=1)
+def _get_console():
+    """Create the shared Rich console, importing Rich on first use"""
+    from rich.console import Console
+    
+    return Console()
 
-console = Console()
+class _LazyConsole:
+    """
+    Stand-in for the shared Rich console
+    
+    Attribute access is forwarded to the real console, which is only
+    created (and Rich imported) the first time something is printed.
+    """
+    
+    def __getattr__(self, name):
+        return getattr(_get_console(), name)
+
+console = _LazyConsole()
 
 def print_banner():
     """Print the SparkBaaS ASCII art banner"""
-    if PYFIGLET_AVAILABLE:
+    from rich.panel import Panel
+    from rich.text import Text
+    
+    try:
+        import pyfiglet
+    except ImportError:
+        pyfiglet = None
+    
+    if pyfiglet is not None:
         # Use pyfiglet to generate ASCII art
         fig = pyfiglet.Figlet(font='slant')
         banner = fig.renderText('SparkBaaS')
@@ -32,44 +49,79 @@ def print_banner():
     
     console.print(panel)
 
+@functools.lru_cache(maxsize=1)
+def _message_parts():
+    """
+    Import rich.text and build the styled message prefixes once
+    
+    Returns:
+        Tuple of (Text class, dict of message kind -> prefix Text)
+    """
+    from rich.text import Text
+    
+    # Styled as a span rather than the Text's base style, which would carry
+    # over to the message appended after it
+    prefixes = {
+        "step": Text.assemble(("◉", "bold blue"), " "),
+        "success": Text.assemble(("✓", "bold green"), " "),
+        "warning": Text.assemble(("⚠", "bold yellow"), " "),
+        "error": Text.assemble(("✗", "bold red"), " "),
+        "info": Text.assemble(("ℹ", "bold cyan"), " "),
+    }
+    return Text, prefixes
+
+def _print_message(kind, message, style=""):
+    """
+    Print a message after its prefix
+    
+    The message is printed as plain text rather than parsed for markup, so
+    brackets in it are shown as is.
+    """
+    Text, prefixes = _message_parts()
+    console.print(prefixes[kind] + Text(str(message), style=style))
+
 def print_step(message):
     """Print a step in the process"""
-    console.print(f"[bold blue]◉[/bold blue] [bold white]{message}[/bold white]")
+    _print_message("step", message, "bold white")
 
 def print_success(message):
     """Print a success message"""
-    console.print(f"[bold green]✓[/bold green] {message}")
+    _print_message("success", message)
 
 def print_warning(message):
     """Print a warning message"""
-    console.print(f"[bold yellow]⚠[/bold yellow] {message}")
+    _print_message("warning", message)
 
 def print_error(message):
     """Print an error message"""
-    console.print(f"[bold red]✗[/bold red] {message}")
+    _print_message("error", message)
 
 def print_info(message):
     """Print an informational message"""
-    console.print(f"[bold cyan]ℹ[/bold cyan] {message}")
+    _print_message("info", message)
 
 def print_section(title):
     """Print a section header"""
-    console.print(f"\n[bold cyan]━━━ {title} ━━━[/bold cyan]")
+    Text = _message_parts()[0]
+    console.print(Text(f"\n━━━ {title} ━━━", style="bold cyan"))
 
-def confirm(message, default=True):
-    """Ask for confirmation"""
+@functools.lru_cache(maxsize=1)
+def _questionary():
+    """Import questionary on the first prompt"""
     import questionary
     
-    return questionary.confirm(
+    return questionary
+
+def confirm(message, default=True):
+    """Ask for confirmation"""
+    return _questionary().confirm(
         message,
         default=default
     ).ask()
 
 def select(message, choices, default=None):
     """Show a selection menu"""
-    import questionary
-    
-    return questionary.select(
+    return _questionary().select(
         message,
         choices=choices,
         default=default